@@ -0,0 +1,143 @@
+"""Benchmark queries with the tool calls and answers the fake model scripts."""
+
+CORPUS = [
+    {
+        "name": "greeting",
+        "query": "Hi there!",
+        "tool_calls": [],
+        "answer": "Hello! How can I help you find properties on HAR.com?",
+    },
+    {
+        "name": "terminology",
+        "query": "What does 'option pending' mean?",
+        "tool_calls": [],
+        "answer": "Option pending means the seller accepted an offer and the buyer is in the option period.",
+    },
+    {
+        "name": "city_search",
+        "query": "Show me 3 bedroom homes in Houston under $400k",
+        "tool_calls": [
+            {
+                "name": "search_properties",
+                "args": {
+                    "fields": {
+                        "city": ["Houston"],
+                        "bedrooms_beds": {"equal": 3},
+                        "price": {"max": 400000},
+                        "for_sale": 1,
+                        "home_only": True,
+                    }
+                },
+            }
+        ],
+    },
+    {
+        "name": "school_search",
+        "query": "Homes in Katy ISD zoned to Seven Lakes High School with a pool",
+        "tool_calls": [
+            {
+                "name": "search_properties",
+                "args": {
+                    "fields": {
+                        "school_district": "Katy ISD",
+                        "high_school": "Seven Lakes",
+                        "pool": True,
+                        "for_sale": 1,
+                    }
+                },
+            }
+        ],
+    },
+    {
+        "name": "community_search",
+        "query": "Townhouses in cinco ranch with a study, newest first",
+        "tool_calls": [
+            {
+                "name": "search_properties",
+                "args": {
+                    "fields": {
+                        "community": ["cinco ranch"],
+                        "property_type": ["Townhouse/Condo"],
+                        "studyrm": True,
+                        "sort": "listdate desc",
+                        "for_sale": 1,
+                    }
+                },
+            }
+        ],
+    },
+    {
+        "name": "withdrawn_search",
+        "query": "Withdrawn listings in Sugar Land",
+        "tool_calls": [
+            {
+                "name": "search_properties",
+                "args": {"fields": {"city": ["Sugar Land"], "availablity": ["WITH"], "for_sale": 1}},
+            }
+        ],
+    },
+    {
+        "name": "address_lookup",
+        "query": "Tell me about 1234 Westheimer Rd",
+        "tool_calls": [
+            {"name": "search_properties_by_address", "args": {"obj": {"address": "1234 Westheimer Rd"}}}
+        ],
+        "answer": "1234 Westheimer Rd is a 3 bedroom home listed for $450,000.",
+    },
+    {
+        "name": "mls_lookup",
+        "query": "MLS 20000003",
+        "tool_calls": [
+            {"name": "search_properties", "args": {"fields": {"mls_number": "20000003", "for_sale": 1}}}
+        ],
+    },
+    {
+        "name": "address_candidates",
+        "query": "Tell me about the house on Westheimer",
+        "tool_calls": [
+            {
+                "name": "search_properties_by_address",
+                "args": {"obj": {"address": "Westheimer", "candidates": 5}},
+            }
+        ],
+        "answer": "Here are the five closest matches on Westheimer Rd.",
+    },
+    {
+        "name": "compare",
+        "query": "Compare HAR 8000001, 8000002 and 8000003",
+        "tool_calls": [
+            {
+                "name": "search_properties_by_address",
+                "args": {"obj": {"harids": [8000001, 8000002, 8000003]}},
+            }
+        ],
+        "answer": "The three homes differ mostly in price and size.",
+    },
+    {
+        "name": "agent_lookup",
+        "query": "Find agent Jane Doe",
+        "tool_calls": [{"name": "search_agent", "args": {"Name": "Jane Doe"}}],
+        "answer": "Here are the agents matching Jane Doe on HAR.com.",
+    },
+    {
+        "name": "compound",
+        "query": "Who is agent John Smith and what homes are for sale in Katy?",
+        "tool_calls": [
+            {"name": "search_agent", "args": {"Name": "John Smith"}},
+            {"name": "search_properties", "args": {"fields": {"city": ["Katy"], "for_sale": 1}}},
+        ],
+        "answer": "John Smith is a HAR.com agent; here are homes for sale in Katy.",
+    },
+    {
+        "name": "fair_housing",
+        "query": "Show me homes in Katy with no kids in the neighborhood, ideal for couples",
+        "tool_calls": [],
+        "answer": "I'm sorry, but I cannot assist with this request as it may conflict with the Fair Housing Act.",
+    },
+    {
+        "name": "off_topic",
+        "query": "Tell me a joke",
+        "tool_calls": [],
+        "answer": "I can only assist with questions about HAR.com property listings and services.",
+    },
+]
@@ -0,0 +1,66 @@
+"""Scripted chat model that stands in for GPT-4o during benchmarks."""
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from my_agent.utils.parser import render_answer
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Answers from the current corpus entry after `latency` seconds.
+
+    role="agent" emits the entry's tool calls (or its answer when it has
+    none); role="output_parser" emits the entry's answer in the Answer shape.
+    """
+
+    role: str = "agent"
+    latency: float = 0.0
+    script: Dict[str, Any] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+    def _result(self) -> ChatResult:
+        answer = self.script.get("answer", "")
+        if self.role == "output_parser":
+            message = AIMessage(content=render_answer(answer))
+        elif self.script.get("tool_calls"):
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": call["name"], "args": call["args"], "id": f"call_{uuid.uuid4().hex[:12]}"}
+                    for call in self.script["tool_calls"]
+                ],
+            )
+        else:
+            message = AIMessage(content=answer)
+        return ChatResult(generations=[ChatGeneration(message=message)])
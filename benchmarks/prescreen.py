@@ -0,0 +1,99 @@
+"""Precision, recall and latency of the local pre-screen.
+
+Runs every case of `benchmarks/prescreen_corpus.py` through `screen()` and
+reports, per verdict, how many refusals were right (precision) and how many
+expected refusals were caught (recall). Allowed messages that were refused
+are the false positives to watch.
+
+    python -m benchmarks.prescreen
+    python -m benchmarks.prescreen --output prescreen.json
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from benchmarks.prescreen_corpus import CASES
+from benchmarks.run import configure_environment, summarize
+
+
+def evaluate(screen) -> Dict[str, Any]:
+    true_positive, false_positive, false_negative = Counter(), Counter(), Counter()
+    mistakes = []
+    for message, expected in CASES:
+        verdict = screen(message)
+        if verdict == expected:
+            if verdict is not None:
+                true_positive[verdict] += 1
+            continue
+        mistakes.append({"message": message, "expected": expected, "verdict": verdict})
+        if verdict is not None:
+            false_positive[verdict] += 1
+        if expected is not None:
+            false_negative[expected] += 1
+
+    verdicts = sorted({e for _, e in CASES if e} | set(false_positive))
+    per_verdict = {}
+    for verdict in verdicts:
+        tp, fp, fn = true_positive[verdict], false_positive[verdict], false_negative[verdict]
+        per_verdict[verdict] = {
+            "precision": tp / (tp + fp) if tp + fp else 1.0,
+            "recall": tp / (tp + fn) if tp + fn else 1.0,
+            "support": tp + fn,
+        }
+    tp, fp, fn = sum(true_positive.values()), sum(false_positive.values()), sum(false_negative.values())
+    return {
+        "overall": {
+            "precision": tp / (tp + fp) if tp + fp else 1.0,
+            "recall": tp / (tp + fn) if tp + fn else 1.0,
+            "false_refusals": sum(1 for m in mistakes if m["expected"] is None),
+        },
+        "verdicts": per_verdict,
+        "mistakes": mistakes,
+    }
+
+
+def latency(screen, rounds: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(rounds):
+        for message, _ in CASES:
+            start = time.perf_counter()
+            screen(message)
+            samples.append(time.perf_counter() - start)
+    summary = summarize(samples)
+    return {key.replace("_ms", "_us"): value * 1000 if key.endswith("_ms") else value for key, value in summary.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200, help="timing passes over the corpus")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    configure_environment("http://127.0.0.1")
+    from my_agent.utils.prescreen import screen
+
+    report = evaluate(screen)
+    report["latency_us"] = latency(screen, args.rounds)
+
+    print(f"{'verdict':<22} {'precision':>9} {'recall':>7} {'support':>8}")
+    for verdict, scores in report["verdicts"].items():
+        print(f"{verdict:<22} {scores['precision']:9.2f} {scores['recall']:7.2f} {scores['support']:8d}")
+    overall = report["overall"]
+    print(f"{'overall':<22} {overall['precision']:9.2f} {overall['recall']:7.2f}")
+    print(f"false refusals: {overall['false_refusals']}")
+    for mistake in report["mistakes"]:
+        print(f"  expected {mistake['expected']!s:<22} got {mistake['verdict']!s:<22} {mistake['message']}")
+    timing = report["latency_us"]
+    print(f"latency p50 {timing['p50_us']:.1f} us   p95 {timing['p95_us']:.1f} us")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Offline latency benchmark for the agent graph.
+
+Runs every query of the corpus through `graph.invoke` (or `graph.ainvoke`
+with --async) against the stub HAR API and the scripted chat model, and
+reports per-node and end-to-end latency.
+
+    python -m benchmarks.run --iterations 20 --model-latency 0.8 --output run.json
+    python -m benchmarks.run --compare baseline.json --output run.json
+    python -m benchmarks.run --async --concurrency 200 --model-latency 0.8 --api-latency 0.2
+    python -m benchmarks.run --llm-stub   # real ChatOpenAI clients against the stub's /v1
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.stub_server import StubServer
+
+STUB_ENV = {
+    "V1_URL": "https://api.har.com",
+    "TEST_MODE": "1",
+    "HAR_SECRET_KEY": "benchmark",
+    "HAR_TOKEN": "benchmark",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "LANGCHAIN_TRACING_V2": "false",
+    "LANGCHAIN_API_KEY": "benchmark",
+}
+
+
+def configure_environment(stub_url: str, llm_stub: bool = False) -> None:
+    """Point the agent at the stub; must run before my_agent is imported.
+
+    With `llm_stub` the OpenAI models also talk to the stub's /v1 endpoint.
+    """
+    for key, value in STUB_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+    os.environ["HAR_API_BASE_URL"] = stub_url
+    os.environ["HAR_WEB_BASE_URL"] = stub_url
+    if llm_stub:
+        os.environ["OPENAI_BASE_URL"] = f"{stub_url}/v1"
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def make_node_timer(node_names):
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class NodeTimer(BaseCallbackHandler):
+        """Times the direct children of the graph run, i.e. the graph nodes."""
+
+        def __init__(self):
+            self.roots = set()  # one per graph run; --async runs several at once
+            self.started: Dict[Any, tuple] = {}
+            self.samples: Dict[str, List[float]] = defaultdict(list)
+
+        def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+            if parent_run_id is None:
+                self.roots.add(run_id)
+            elif parent_run_id in self.roots and kwargs.get("name") in node_names:
+                self.started[run_id] = (kwargs["name"], time.perf_counter())
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            if run_id in self.started:
+                name, start = self.started.pop(run_id)
+                self.samples[name].append(time.perf_counter() - start)
+
+        on_chain_error = on_chain_end
+
+    return NodeTimer
+
+
+def reset_caches() -> None:
+    from my_agent.utils import pagination, tool_utils
+
+    for cache in (
+        tool_utils.id_lookup_cache,
+        tool_utils.listing_cache,
+        tool_utils.status_list_cache,
+        tool_utils.property_detail_cache,
+        pagination.cursor_store,
+    ):
+        cache.clear()
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    from benchmarks.corpus import CORPUS
+    from benchmarks.fake_model import ScriptedChatModel
+    from my_agent import agent
+    from my_agent.utils.model_registry import registry
+
+    agent_model = ScriptedChatModel(role="agent", latency=args.model_latency)
+    parser_model = ScriptedChatModel(role="output_parser", latency=args.model_latency)
+    if args.llm_stub:
+        # Real ChatOpenAI clients from the registry, talking to the stub's /v1
+        models = {"model_name": "openai", "parser_model_name": "openai"}
+    else:
+        registry.register("scripted_agent", agent_model)
+        registry.register("scripted_parser", parser_model)
+        models = {"model_name": "scripted_agent", "parser_model_name": "scripted_parser"}
+    # One loop for every async run, as in the server: pooled connections belong to it
+    loop = asyncio.new_event_loop() if args.use_async else None
+
+    node_names = set(agent.graph.nodes) - {"__start__"}
+    NodeTimer = make_node_timer(node_names)
+    corpus = [entry for entry in CORPUS if not args.only or entry["name"] in args.only]
+
+    results = {}
+    for entry in corpus:
+        timer = NodeTimer()
+        end_to_end = []
+        for _ in range(args.warmup + args.iterations):
+            if args.cold:
+                reset_caches()
+            agent_model.script = parser_model.script = entry
+            config = {
+                "callbacks": [timer],
+                "configurable": {
+                    "thread_id": str(uuid.uuid4()),
+                    "structured_output": args.structured_output,
+                    **models,
+                },
+            }
+            if args.use_async:
+                end_to_end.extend(
+                    loop.run_until_complete(run_concurrently(agent.graph, entry, config, args.concurrency))
+                )
+                continue
+            start = time.perf_counter()
+            agent.graph.invoke({"messages": [("human", entry["query"])]}, config)
+            end_to_end.append(time.perf_counter() - start)
+        skip = args.warmup * (args.concurrency if args.use_async else 1)
+        results[entry["name"]] = {
+            "end_to_end": summarize(end_to_end[skip:]),
+            "nodes": {
+                name: summarize(samples[-(len(end_to_end) - skip):])
+                for name, samples in sorted(timer.samples.items())
+            },
+        }
+        print(f"{entry['name']:<20} p50 {results[entry['name']]['end_to_end']['p50_ms']:8.1f} ms")
+    if loop is not None:
+        loop.close()
+    return results
+
+
+async def run_concurrently(graph, entry, config, concurrency: int) -> List[float]:
+    """Run `concurrency` conversations at once on one event loop; their latencies."""
+
+    async def one() -> float:
+        start = time.perf_counter()
+        configurable = {**config["configurable"], "thread_id": str(uuid.uuid4())}
+        await graph.ainvoke({"messages": [("human", entry["query"])]}, {**config, "configurable": configurable})
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(concurrency)))
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\n{'query':<20} {'baseline p50':>14} {'current p50':>14} {'change':>8}")
+    for name, result in current["queries"].items():
+        before = baseline["queries"].get(name)
+        if not before:
+            continue
+        old = before["end_to_end"]["p50_ms"]
+        new = result["end_to_end"]["p50_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{name:<20} {old:12.1f}ms {new:12.1f}ms {change:+7.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--model-latency", type=float, default=0.0, help="seconds per fake model call")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="seconds per stub API response")
+    parser.add_argument("--cold", action="store_true", help="clear the agent caches before every run")
+    parser.add_argument("--only", nargs="*", help="corpus entries to run")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--llm-stub", action="store_true", help="use real OpenAI clients against the stub's /v1 endpoint")
+    parser.add_argument("--structured-output", action="store_true", help="output_parser uses native structured output")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="run the graph with ainvoke")
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent conversations per iteration (--async)")
+    args = parser.parse_args(argv)
+
+    with StubServer(latency=args.api_latency, llm_latency=args.model_latency) as stub_url:
+        configure_environment(stub_url, args.llm_stub)
+        queries = run_benchmark(args)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "iterations": args.iterations,
+            "model_latency": args.model_latency,
+            "api_latency": args.api_latency,
+            "cold": args.cold,
+            "llm_stub": args.llm_stub,
+            "structured_output": args.structured_output,
+            "async": args.use_async,
+            "concurrency": args.concurrency if args.use_async else 1,
+        },
+        "queries": queries,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Cold-start benchmark: import time of the graph module and first-request latency.
+
+Every trial runs in a fresh interpreter against the stub HAR API, with the
+real OpenAI clients of the model registry talking to the stub's
+OpenAI-compatible endpoint. Building the models and opening their
+connections shows up either in the first request or, with --warmup, in the
+warm-up step.
+
+    python -m benchmarks.startup --trials 5
+    python -m benchmarks.startup --trials 5 --warmup --output startup.json
+    python -m benchmarks.startup --importtime
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+from benchmarks.run import configure_environment, git_revision, summarize
+from benchmarks.stub_server import StubServer
+
+QUERY = "city_search"
+
+
+def child(args) -> None:
+    """One trial; prints its timings as JSON on stdout."""
+    configure_environment(args.stub_url, llm_stub=True)
+    timings: Dict[str, Any] = {}
+
+    start = time.perf_counter()
+    from my_agent import agent
+    timings["import"] = time.perf_counter() - start
+
+    from benchmarks.corpus import CORPUS
+
+    if args.warmup:
+        from my_agent.utils.warmup import warm_up
+
+        start = time.perf_counter()
+        timings["warmup_steps"] = warm_up(["openai"])
+        timings["warmup"] = time.perf_counter() - start
+
+    entry = next(e for e in CORPUS if e["name"] == QUERY)
+    for label in ("first_request", "second_request"):
+        config = {"configurable": {"thread_id": str(uuid.uuid4()), "model_name": "openai"}}
+        start = time.perf_counter()
+        agent.graph.invoke({"messages": [("human", entry["query"])]}, config)
+        timings[label] = time.perf_counter() - start
+
+    print(json.dumps(timings))
+
+
+def run_trial(stub_url: str, warmup: bool) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "benchmarks.startup", "--child", "--stub-url", stub_url]
+    if warmup:
+        cmd.append("--warmup")
+    out = subprocess.check_output(cmd, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def import_profile(stub_url: str, top: int) -> List[str]:
+    """Slowest modules (cumulative) when importing my_agent.agent, via -X importtime."""
+    configure_environment(stub_url, llm_stub=True)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import my_agent.agent"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, module = [p.strip() for p in line.split("|")]
+        rows.append((int(cumulative_us), module))
+    rows.sort(reverse=True)
+    return [f"{us / 1000:9.1f} ms  {module}" for us, module in rows[:top]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="call warm_up() before the first request")
+    parser.add_argument("--importtime", action="store_true", help="print the slowest imports and exit")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--stub-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args)
+        return 0
+
+    with StubServer() as stub_url:
+        if args.importtime:
+            print("\n".join(import_profile(stub_url, args.top)))
+            return 0
+        trials = [run_trial(stub_url, args.warmup) for _ in range(args.trials)]
+
+    keys = ["import", "warmup", "first_request", "second_request"]
+    results = {key: summarize([t[key] for t in trials]) for key in keys if key in trials[0]}
+    for key, summary in results.items():
+        print(f"{key:<16} p50 {summary['p50_ms']:8.1f} ms   max {summary['max_ms']:8.1f} ms")
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "trials": args.trials,
+                "warmup": args.warmup,
+            },
+            "startup": results,
+            "trials": trials,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Local stand-in for api.har.com and the har.com typeapp lookups.
+
+Responses have the same shape as the real endpoints but are generated from a
+seed, so runs are repeatable. `latency` adds a fixed delay to every response.
+Property details carry an ETag and answer a matching If-None-Match with 304.
+
+It also serves an OpenAI-compatible `POST /v1/chat/completions` that answers
+from benchmarks/corpus.py: the entry whose query appears in the request gets
+its tool calls (when tools are offered) or its answer, also as an Answer
+function call for native structured output. `llm_latency` delays those
+responses.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+TOTAL_LISTINGS = 120
+CITIES = ["Houston", "Katy", "Sugar Land", "Cypress", "Spring", "Pearland"]
+STREETS = ["Main St", "Westheimer Rd", "Memorial Dr", "Fry Rd", "Mason Rd", "Kirby Dr"]
+PROPERTY_TYPES = ["Single-Family", "Townhouse/Condo", "Mid/Hi-Rise Condo"]
+
+
+def make_listing(index: int) -> Dict[str, Any]:
+    rng = random.Random(index)
+    harid = 8000000 + index
+    agent = rng.choice(["Jane Doe", "John Smith", "Maria Garcia", "Wei Chen"])
+    return {
+        "id": str(index),
+        "status_short": "A",
+        "mlsnum": str(20000000 + index),
+        "harid": str(harid),
+        "share_url": f"https://www.har.com/homedetail/{harid}",
+        "address": f"{100 + index} {rng.choice(STREETS)}",
+        "price": str(rng.randrange(150_000, 1_500_000, 5_000)),
+        "bed": str(rng.randint(1, 6)),
+        "bath": f"{rng.randint(1, 4)}/{rng.randint(0, 1)}",
+        "city": rng.choice(CITIES),
+        "zip": str(rng.choice([77002, 77024, 77027, 77449, 77479, 77494])),
+        "sqft": str(rng.randint(800, 6000)),
+        "agent": agent,
+        "agentlistid": f"{agent.split()[0].upper()}{index}",
+        "photo": f"https://photos.har.com/{harid}/1.jpg",
+        "status": "Active",
+        "status_text": "For Sale",
+        "agentphoto": f"https://photos.har.com/agents/{index}.jpg",
+        "broker": "Stub Realty",
+        "propertytype": rng.choice(PROPERTY_TYPES),
+        "bookmarked": False,
+    }
+
+
+def listing_response(query: Dict[str, str]) -> Dict[str, Any]:
+    start = int(query.get("start") or 0)
+    size = int(query.get("max") or 5)
+    listings = [make_listing(i) for i in range(start, min(start + size, TOTAL_LISTINGS))]
+    full = [make_listing(i) for i in range(40)]
+    status_list = {"total": len(full), "start": 0, "stop": len(full), "listings": full}
+    return {
+        "total": TOTAL_LISTINGS,
+        "start": start,
+        "stop": start + len(listings),
+        "listings": listings,
+        "withdrawn": status_list,
+        "terminate": status_list,
+        "expire": status_list,
+    }
+
+
+def property_response(harid: int) -> Dict[str, Any]:
+    listing = make_listing(harid - 8000000)
+    titles = ["Bedrooms", "Baths", "Subdivision", "Year Built", "Lotsize", "Building Sqft"]
+    values = [listing["bed"], listing["bath"], "Stub Estates", "2005", "7,200", listing["sqft"]]
+    return {
+        "status": "success",
+        "harid": listing["harid"],
+        "mlsnum": listing["mlsnum"],
+        "share_url": listing["share_url"],
+        "detail": {
+            "type": "listing",
+            "date": "2025-01-15 10:00:00",
+            "address": listing["address"],
+            "price": listing["price"],
+            "city": listing["city"],
+            "zip": listing["zip"],
+            "sqft": listing["sqft"],
+            "status": listing["status"],
+            "detailitems": {"titles": titles, "values": values},
+        },
+        "realtor": {"agentname": listing["agent"], "photo": listing["agentphoto"], "phone": "713-555-0100"},
+        "broker": {"officename": listing["broker"], "phone": "713-555-0199"},
+        "photos": {"urls": [f"{listing['photo'][:-5]}{i}.jpg" for i in range(1, 30)]},
+        "schools": [
+            {"name": f"Stub {level} School", "district": "Katy ISD", "rating": "A"}
+            for level in ("Elementary", "Middle", "High")
+        ],
+        "rooms": [{"name": "Living Room", "size": "20x18"}, {"name": "Kitchen", "size": "15x12"}],
+        "rooms_metric": [{"name": "Living Room", "size": "6x5"}, {"name": "Kitchen", "size": "5x4"}],
+        "mortgage": {"rate": 6.5, "term": 30, "down_payment": 20},
+        "tax": [{"year": 2024, "amount": 9800}],
+        "neighborhoodinfo": {"description": "A quiet neighborhood. " * 40},
+        "extra": {"finance": {"data": [{"Tax Rate": "2.1"}]}, "lease": {"data": []}},
+    }
+
+
+def _corpus_entry(messages) -> Dict[str, Any]:
+    from benchmarks.corpus import CORPUS
+
+    text = " ".join(
+        m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+        for m in messages
+    )
+    for entry in sorted(CORPUS, key=lambda e: -len(e["query"])):
+        if entry["query"] in text:
+            return entry
+    return {"tool_calls": [], "answer": "How can I help you find properties on HAR.com?"}
+
+
+def chat_completion_response(request: Dict[str, Any]) -> Dict[str, Any]:
+    """A chat completion in the OpenAI wire format, scripted from the corpus."""
+    messages = request.get("messages", [])
+    entry = _corpus_entry(messages)
+    message: Dict[str, Any] = {"role": "assistant", "content": None}
+    finish_reason = "stop"
+    tool_names = [tool.get("function", {}).get("name", "") for tool in request.get("tools") or []]
+    answer = {"pretext": entry.get("answer", ""), "Card": None}
+    if not tool_names:
+        # output_parser: the answer in the Answer shape
+        message["content"] = json.dumps(answer)
+    elif tool_names[0].startswith("Answer"):
+        # output_parser with native structured output: the Answer as a function call
+        message["tool_calls"] = [
+            {"id": "call_answer", "type": "function", "function": {"name": tool_names[0], "arguments": json.dumps(answer)}}
+        ]
+        finish_reason = "tool_calls"
+    elif entry["tool_calls"] and messages and messages[-1].get("role") == "user":
+        message["tool_calls"] = [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call["args"])},
+            }
+            for i, call in enumerate(entry["tool_calls"])
+        ]
+        finish_reason = "tool_calls"
+    else:
+        message["content"] = entry.get("answer", "")
+    prompt_tokens = len(json.dumps(messages)) // 4
+    return {
+        "id": f"chatcmpl-{random.getrandbits(48):x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 20, "total_tokens": prompt_tokens + 20},
+    }
+
+
+def member_response(query: Dict[str, str]) -> Dict[str, Any]:
+    name = query.get("agent", "Agent")
+    return {
+        "members": [
+            {"name": f"{name} {i}", "email": f"agent{i}@stub.har.com", "phone": "713-555-0100"}
+            for i in range(8)
+        ]
+    }
+
+
+def quicksearch_response(query: Dict[str, str]) -> Dict[str, Any]:
+    seed = sum(map(ord, query.get("query", "")))
+    return {"results": [{"harid": 8000000 + (seed + i) % TOTAL_LISTINGS} for i in range(5)]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the client pool is exercised
+    latency = 0.0
+    llm_latency = 0.0
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.llm_latency)
+        self._send_json(chat_completion_response(request), {"Content-Type": "application/json"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        headers = {"Content-Type": "application/json"}
+        time.sleep(self.latency)
+
+        if url.path in ("/listing", "/sold"):
+            body: Any = listing_response(query)
+        elif url.path == "/member":
+            body = member_response(query)
+        elif url.path == "/chatbot/quicksearch":
+            body = quicksearch_response(query)
+        elif url.path.startswith("/chatbot/property/"):
+            harid = url.path.rsplit("/", 1)[-1]
+            etag = f'"{harid}-1"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = property_response(int(harid))
+            headers["ETag"] = etag
+        elif url.path == "/api/typeapp/mpcfinder":
+            body = [{"community": 1000 + len(query.get("query", ""))}]
+        elif url.path == "/api/typeapp/schoolsearchfilter":
+            body = [{"base_id": f"{query.get('type', 'D')}{len(query.get('query', ''))}"}]
+        else:
+            self.send_error(404)
+            return
+
+        self._send_json(body, headers)
+
+    def _send_json(self, body: Any, headers: Dict[str, str]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Run the stub API on a background thread: `with StubServer() as url: ...`"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, llm_latency: float = 0.0):
+        handler = type("Handler", (StubHandler,), {"latency": latency, "llm_latency": llm_latency})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubServer(args.port, args.latency, args.llm_latency)
+    url = server.start()
+    print(f"Stub HAR API listening on {url}; OPENAI_BASE_URL={url}/v1")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
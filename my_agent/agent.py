@@ -1,28 +1,69 @@
 from typing import TypedDict, Literal
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from my_agent.utils.nodes import call_model, should_continue, tool_node1,tool_node2, output_parser, tool_node3
+from my_agent.utils.nodes import (
+    prescreen,
+    aprescreen,
+    after_prescreen,
+    route_message,
+    aroute_message,
+    after_router,
+    call_model,
+    acall_model,
+    should_continue,
+    call_tools,
+    acall_tools,
+    output_parser,
+    aoutput_parser,
+)
 from my_agent.utils.state import AgentState
+from my_agent.utils.metrics import instrument_node, start_metrics_server
+from my_agent.utils.models.constants import CHECKPOINTER, METRICS_PORT, WARMUP_ON_IMPORT, WARMUP_MODELS
 
 
 # Define the config
 class GraphConfig(TypedDict):
     model_name: Literal[ "openai"]
+    # Model of the output_parser node; both are shared instances from the model registry
+    parser_model_name: Literal["openai", "anthropic"]
+    # output_parser uses the provider's native structured output instead of the prompt schema
+    structured_output: bool
+    # Skip the /listing result cache and always query the HAR API
+    bypass_search_cache: bool
+    # Token budget for the chat history sent to the agent model
+    history_token_budget: int
+    # Refuse fair-housing violations and off-topic messages without a model call
+    prescreen: bool
+    # Look up MLS numbers, HAR IDs and addresses without a model call
+    router: bool
 
 
 # Define a new graph
 workflow = StateGraph(AgentState, config_schema=GraphConfig)
 
+
+
+def node(name, func, afunc):
+    """A node that runs `func` under graph.invoke and `afunc` under graph.ainvoke."""
+    return RunnableLambda(instrument_node(name, func), afunc=instrument_node(name, afunc), name=name)
+
+
 # Define the two nodes we will cycle between
-workflow.add_node("agent", call_model)
-workflow.add_node("output_parser", output_parser)
-workflow.add_node("search_properties", tool_node1)
-workflow.add_node("search_agent", tool_node2)
-workflow.add_node("search_properties_by_address", tool_node3)
+workflow.add_node("prescreen", node("prescreen", prescreen, aprescreen))
+workflow.add_node("router", node("router", route_message, aroute_message))
+workflow.add_node("agent", node("agent", call_model, acall_model))
+workflow.add_node("output_parser", node("output_parser", output_parser, aoutput_parser))
+workflow.add_node("tools", node("tools", call_tools, acall_tools))
 
-# Set the entrypoint as `agent`
+# Set the entrypoint as `prescreen`
 # This means that this node is the first one called
-workflow.set_entry_point("agent")
+workflow.set_entry_point("prescreen")
+
+# A message the pre-screen refused is already answered; the rest go to `router`
+workflow.add_conditional_edges("prescreen", after_prescreen, ["router", END])
+# Lookups by MLS number, HAR ID or address go straight to `tools`, the rest to `agent`
+workflow.add_conditional_edges("router", after_router, ["tools", "agent"])
 
 # We now add a conditional edge
 workflow.add_conditional_edges(
@@ -38,18 +79,36 @@ workflow.add_conditional_edges(
     # will be matched against the keys in this mapping.
     # Based on which one it matches, that node will then be called.
         # If `tools`, then we call the tool node.
-       [  "search_properties","search_agent","search_properties_by_address", "output_parser"],
+       [  "tools", END],
 )
 
-# We now add a normal edge from `tools` to `agent`.
-# This means that after `tools` is called, `agent` node is called next.
-workflow.add_edge("search_properties", "output_parser")
-workflow.add_edge("search_agent", "output_parser")
-workflow.add_edge("search_properties_by_address", "output_parser")
+# We now add a normal edge from `tools` to `output_parser`.
+# `tools` runs every tool call of the turn concurrently, and `output_parser`
+# merges their results into one answer.
+workflow.add_edge("tools", "output_parser")
 # workflow.add_edge("output_parser", "agent")
 workflow.add_edge("output_parser", END)
 
 # Finally, we compile it!
 # This compiles it into a LangChain Runnable,
 # meaning you can use it as you would any other runnable
-graph = workflow.compile()
+# Threads are checkpointed in Redis when configured, so any worker can serve them
+if CHECKPOINTER:
+    from my_agent.utils.redis_store import InMemoryRedis, RedisCheckpointSaver, get_redis_checkpointer
+
+    checkpointer = (
+        RedisCheckpointSaver(InMemoryRedis()) if CHECKPOINTER == "memory" else get_redis_checkpointer()
+    )
+    graph = workflow.compile(checkpointer=checkpointer)
+else:
+    graph = workflow.compile()
+
+# Expose latency, error and cache metrics for Prometheus when configured
+if METRICS_PORT:
+    start_metrics_server(METRICS_PORT)
+
+# Pay the cold-start costs at startup instead of on the first request
+if WARMUP_ON_IMPORT:
+    from my_agent.utils.warmup import warm_up
+
+    warm_up(WARMUP_MODELS)
@@ -0,0 +1,222 @@
+"""Async counterparts of the upstream calls in tool_utils.
+
+They share tool_utils' request signing, caches and response handling, and
+go out through the pooled async client, so a run waiting on HAR's API
+holds no thread. Names mirror the sync functions with an `a` prefix.
+"""
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from my_agent.utils.cache import MISSING
+from my_agent.utils.http_client import ahar_api_get, ahttp_get
+from my_agent.utils.models.constants import (
+    API_SUCCESS_CODE,
+    HAR_WEB_BASE_URL,
+    ID_LOOKUP_DEADLINE,
+    PROPERTY_DETAILS_DEADLINE,
+)
+from my_agent.utils.singleflight import single_flight
+from my_agent.utils.tool_utils import (
+    ID_LOOKUP_HEADERS,
+    LOOKUP_TIMED_OUT,
+    _id_cache_key,
+    build_listing_path,
+    cached_property_detail,
+    canonical_query_key,
+    id_lookup_cache,
+    id_lookup_url,
+    listing_cache,
+    signed_headers,
+    status_list_cache,
+    store_id_lookup,
+    store_property_detail,
+)
+
+
+def _decode(content: bytes) -> Any:
+    try:
+        return json.loads(content.decode("utf-8"))
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to decode JSON: {e}")
+        raise
+
+
+async def asigned_api_get(
+    path: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    extra_headers: Optional[Dict[str, str]] = None,
+):
+    headers = signed_headers(path, user_id, member_number, role, extra_headers)
+    return await ahar_api_get(path.replace(" ", "%20"), headers)
+
+
+@single_flight("aget_property_search", lambda path: path)
+async def aget_property_search(path: str) -> Tuple[Dict[str, Any], int]:
+    res = await asigned_api_get(path.replace("#", ""))
+    return _decode(res.content), res.status_code
+
+
+@single_flight(
+    "aget_property_details",
+    lambda path, user_id=None, member_number=None, role=0: (path, user_id, member_number, role),
+)
+async def aget_property_details(
+    path: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+) -> Tuple[Dict[str, Any], int]:
+    res = await asigned_api_get(path, user_id, member_number, role)
+    return _decode(res.content), res.status_code
+
+
+@single_flight(
+    "aget_ID",
+    lambda path, payload: (path, payload.get("query", ""), payload.get("type", "")),
+)
+async def aget_ID(path: str, payload: Dict[str, str]) -> Tuple[Dict[str, Any], int]:
+    response = await ahttp_get(id_lookup_url(path, payload), headers=ID_LOOKUP_HEADERS)
+    if response.status_code == API_SUCCESS_CODE:
+        return response.json(), response.status_code
+    logging.error(f"Request failed with status code: {response.status_code}")
+    return {}, response.status_code
+
+
+async def _alookup_id(cache_key, path: str, payload: Dict[str, str], id_field: str) -> Any:
+    cached = id_lookup_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+    try:
+        json_response, status_code = await aget_ID(path, payload)
+    except Exception as e:
+        logging.error(f"Error fetching data for user query {path}: {e}")
+        return {}
+    return store_id_lookup(cache_key, path, json_response, status_code, id_field)
+
+
+async def asearch_community_ID(comm: str) -> Any:
+    return await _alookup_id(
+        _id_cache_key("community", comm),
+        f"{HAR_WEB_BASE_URL}/api/typeapp/mpcfinder",
+        {"query": comm},
+        "community",
+    )
+
+
+async def asearch_school_ID(school: str, type: str) -> Any:
+    return await _alookup_id(
+        _id_cache_key("school", school, type),
+        f"{HAR_WEB_BASE_URL}/api/typeapp/schoolsearchfilter",
+        {"query": school, "type": type},
+        "base_id",
+    )
+
+
+async def aresolve_lookups(
+    lookups: Dict[str, Callable[[], Awaitable[Any]]], deadline: float = ID_LOOKUP_DEADLINE
+) -> Dict[str, Any]:
+    """Async resolve_lookups: run the lookups as tasks under one deadline."""
+    tasks = {name: asyncio.ensure_future(fn()) for name, fn in lookups.items()}
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results = {}
+    for name, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            logging.error(f"ID lookup for {name} exceeded {deadline}s deadline")
+            results[name] = LOOKUP_TIMED_OUT
+        elif task.exception() is not None:
+            logging.error(f"ID lookup for {name} failed: {task.exception()}")
+            results[name] = {}
+        else:
+            results[name] = task.result()
+    return results
+
+
+@single_flight(
+    "aget_property_detail",
+    lambda harid, user_id=None, member_number=None, role=0: (str(harid), user_id, role),
+)
+async def aget_property_detail(
+    harid: Any,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+) -> List[Dict[str, Any]]:
+    key = (str(harid), user_id, role)
+    entry, conditional = cached_property_detail(key)
+    if conditional is None:
+        return entry["properties"]
+    res = await asigned_api_get(
+        f"/chatbot/property/{harid}", user_id, member_number, role, conditional
+    )
+    return store_property_detail(key, entry, conditional, res)
+
+
+async def aget_properties_details(
+    harids: List[Any],
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    deadline: float = PROPERTY_DETAILS_DEADLINE,
+) -> List[Dict[str, Any]]:
+    harids = list(dict.fromkeys(h for h in harids if h))
+    details = await aresolve_lookups(
+        {
+            str(harid): partial(aget_property_detail, harid, user_id, member_number, role)
+            for harid in harids
+        },
+        deadline,
+    )
+    properties = []
+    for harid in harids:
+        result = details.get(str(harid)) or []
+        if result:
+            properties.append({"rank": len(properties) + 1, **result[0]})
+    return properties
+
+
+async def asearch_listings(
+    path: str,
+    cache_key: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    bypass_cache: bool = False,
+) -> Tuple[Dict[str, Any], int]:
+    loader = partial(aget_property_details, path, user_id, member_number, role)
+    cacheable = lambda result: result[1] == API_SUCCESS_CODE
+    if bypass_cache:
+        return await listing_cache.aload(cache_key, loader, cacheable)
+    return await listing_cache.aget_or_load(cache_key, loader, cacheable)
+
+
+async def asearch_status_list(
+    path: str,
+    payload: Dict[str, Any],
+    status_key: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    bypass_cache: bool = False,
+) -> Tuple[Dict[str, Any], int]:
+    payload = {k: v for k, v in payload.items() if k != "start"}
+    cache_key = canonical_query_key(path, payload, user_id, role, status_key)
+    if not bypass_cache:
+        cached = status_list_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached, API_SUCCESS_CODE
+
+    json_response, status_code = await aget_property_details(
+        build_listing_path(path, payload), user_id, member_number, role
+    )
+    status_list = json_response.get(status_key, {}) or {}
+    if status_code == API_SUCCESS_CODE:
+        status_list_cache.set(cache_key, status_list)
+    return status_list, status_code
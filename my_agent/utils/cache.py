@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+# Returned by TTLCache.get on a miss, so that None can be cached as a value.
+MISSING = object()
+
+# Named caches, by name, so their stats can be exported as metrics
+CACHES: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    Once `maxsize` entries (or `max_bytes`, when a `sizeof` estimator is
+    given) are exceeded the least recently used entries are evicted.
+    Hit/miss/eviction counters are kept so the cache can be sized from stats().
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        name: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        # Optional memory budget; `sizeof` estimates an entry's size in bytes
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if name:
+            CACHES[name] = self
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would never fit; don't flush the cache for it
+            self._data[key] = (value, expires_at, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= evicted[2]
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[2]
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+# Strong references to async refreshes, so they are not collected mid-flight
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+class SWRCache(TTLCache):
+    """TTLCache with stale-while-revalidate reads.
+
+    An entry is fresh for `ttl` seconds and may then be served stale for
+    another `stale_ttl` seconds while a single background refresh replaces it.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, stale_ttl: float, name: Optional[str] = None
+    ):
+        super().__init__(maxsize, ttl + stale_ttl, name=name)
+        self.fresh_ttl = ttl
+        self._refreshing = set()
+        self.stale_hits = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        entry = self.get(key)
+        if entry is MISSING:
+            return self.load(key, loader, cacheable)
+        value, fresh_until = entry
+        if time.monotonic() >= fresh_until:
+            self.stale_hits += 1
+            self._refresh_in_background(key, loader, cacheable)
+        return value
+
+    def load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Call the loader and store its result if it is cacheable."""
+        value = loader()
+        if cacheable(value):
+            self.set(key, (value, time.monotonic() + self.fresh_ttl))
+        return value
+
+    def _refresh_in_background(self, key, loader, cacheable) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.load(key, loader, cacheable)
+            except Exception as e:
+                logging.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _refresh_executor.submit(refresh)
+
+    async def aget_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """get_or_load for a coroutine loader; stale refreshes run as tasks."""
+        entry = self.get(key)
+        if entry is MISSING:
+            return await self.aload(key, loader, cacheable)
+        value, fresh_until = entry
+        if time.monotonic() >= fresh_until:
+            self.stale_hits += 1
+            self._arefresh_in_background(key, loader, cacheable)
+        return value
+
+    async def aload(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        value = await loader()
+        if cacheable(value):
+            self.set(key, (value, time.monotonic() + self.fresh_ttl))
+        return value
+
+    def _arefresh_in_background(self, key, loader, cacheable) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self.aload(key, loader, cacheable)
+            except Exception as e:
+                logging.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["stale_hits"] = self.stale_hits
+        return stats
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+
+from my_agent.utils.parser import PropertyCard, render_answer
+
+PROPERTY_CARD_FIELDS = list(PropertyCard.__fields__)
+
+
+def tool_result(message: ToolMessage) -> Optional[Dict[str, Any]]:
+    """Return the dict a tool produced, or None if it can't be recovered."""
+    # Tools keep their full result as the artifact; content is the model's view
+    if isinstance(getattr(message, "artifact", None), dict):
+        return message.artifact
+    content = message.content
+    if isinstance(content, dict):
+        return content
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def tool_payload(message: ToolMessage) -> str:
+    """Return the full tool output as text, preferring the artifact."""
+    artifact = getattr(message, "artifact", None)
+    if artifact is not None:
+        return json.dumps(artifact, ensure_ascii=False, default=str)
+    return message.content
+
+
+def property_card(prop: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one search_properties listing onto the PropertyCard fields."""
+    card = {name: prop.get(name) for name in PROPERTY_CARD_FIELDS}
+    card["Image"] = prop.get("photo")
+    card["Address"] = prop.get("address")
+    card["bookmarked"] = bool(prop.get("bookmarked"))
+    card["islogin"] = bool(prop.get("islogin"))
+    return card
+
+
+def search_pretext(result: Dict[str, Any], shown: int) -> str:
+    if not shown:
+        return (
+            "I couldn't find any properties on HAR.com matching your search. "
+            "Try widening the filters, such as the price range, location or property type."
+        )
+    total = int(result.get("total_number_of_properties") or shown)
+    start = int(result.get("start") or 0)
+    pretext = f"I found {total} properties on HAR.com matching your search. Here are {shown} of them."
+    if total > start + shown:
+        pretext += " Ask me to show more to see the next ones."
+    return pretext
+
+
+def build_search_answer(messages: List[ToolMessage]) -> Optional[str]:
+    """Render search_properties results as an Answer without calling a model.
+
+    Returns None when a tool output can't be parsed, so the caller can fall
+    back to the LLM output parser.
+    """
+    pretexts, cards = [], []
+    for message in messages:
+        result = tool_result(message)
+        if result is None:
+            return None
+        result_cards = [property_card(prop) for prop in result.get("properties") or []]
+        pretexts.append(search_pretext(result, len(result_cards)))
+        cards.extend(result_cards)
+    return render_answer(" ".join(pretexts), cards)
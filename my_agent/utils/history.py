@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from my_agent.utils.cards import tool_result
+
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logging.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+async def aload_encoding() -> None:
+    """Load the tokenizer in a worker thread; the first load may download it."""
+    if _encoding.cache_info().currsize == 0:
+        await asyncio.to_thread(_encoding)
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_tokens(message: BaseMessage) -> int:
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    tokens = count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(tool_call["name"] + json.dumps(tool_call["args"]))
+    return tokens
+
+
+def summarize_tool_message(message: ToolMessage) -> ToolMessage:
+    """Replace a tool payload by a one-line summary of what it returned."""
+    result = tool_result(message)
+    if result is not None and "properties" in result:
+        shown = [
+            f"{prop.get('address')} (harid {prop.get('harid')})"
+            for prop in result.get("properties") or []
+        ]
+        summary = (
+            f"[{message.name} result compacted: "
+            f"{result.get('total_number_of_properties', len(shown))} found; "
+            f"shown: {'; '.join(shown) or 'none'}]"
+        )
+    else:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        summary = f"[{message.name} result compacted: {content[:200]}]"
+    return ToolMessage(
+        content=summary,
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+        id=message.id,
+    )
+
+
+def _turn_starts(messages: Sequence[BaseMessage]) -> List[int]:
+    return [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+
+
+def _last_search_filters(messages: Sequence[BaseMessage]) -> Optional[dict]:
+    for message in reversed(messages):
+        for tool_call in reversed(getattr(message, "tool_calls", None) or []):
+            if tool_call["name"] == "search_properties":
+                return tool_call["args"]
+    return None
+
+
+def compact_history(messages: Sequence[BaseMessage], budget: int) -> List[BaseMessage]:
+    """Fit the conversation into `budget` tokens for the next model call.
+
+    Tool payloads of earlier turns are summarized first, oldest first. If that
+    is not enough, whole turns are dropped from the start. The current turn is
+    never touched, and when the last property search falls out of the window
+    its filters are kept as a system note so "show more" and refinements still
+    build on them.
+    """
+    messages = list(messages)
+    sizes = [message_tokens(m) for m in messages]
+    total = sum(sizes)
+    if total <= budget:
+        return messages
+
+    starts = _turn_starts(messages)
+    current_turn = starts[-1] if starts else len(messages) - 1
+
+    for i in range(current_turn):
+        if total <= budget:
+            break
+        if isinstance(messages[i], ToolMessage):
+            messages[i] = summarize_tool_message(messages[i])
+            new_size = message_tokens(messages[i])
+            total -= sizes[i] - new_size
+            sizes[i] = new_size
+
+    cut = 0
+    for start in starts[1:]:
+        if total <= budget or start > current_turn:
+            break
+        total -= sum(sizes[cut:start])
+        cut = start
+    if not cut:
+        return messages
+
+    kept = messages[cut:]
+    filters = _last_search_filters(messages)
+    if filters is not None and _last_search_filters(kept) is None:
+        note = SystemMessage(
+            content=f"Filters of the last property search in this conversation: {json.dumps(filters)}"
+        )
+        kept = [note] + kept
+    return kept
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from my_agent.utils.metrics import observe_upstream
+from my_agent.utils.rate_limiter import get_limiter
+from my_agent.utils.models.constants import (
+    HAR_API_BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_ASYNC_MAX_CONNECTIONS,
+    HTTP_ASYNC_MAX_KEEPALIVE,
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session shared by every upstream HTTP call.
+
+    Connections are kept alive and pooled per host, up to HTTP_POOL_MAXSIZE
+    idle connections each. The pool never blocks: a caller past that size
+    opens a one-off connection, and the per-host limiter (capped at the pool
+    size) keeps that rare.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    pool_block=False,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def http_get(url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """GET a URL over the shared pool, within the host's adaptive concurrency limit."""
+    with get_limiter(urlparse(url).netloc).slot() as outcome:
+        start = time.perf_counter()
+        try:
+            response = get_session().get(
+                url, headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+            )
+        except requests.RequestException:
+            observe_upstream(url, time.perf_counter() - start, None)
+            raise
+        outcome["status"] = response.status_code
+        observe_upstream(
+            url, time.perf_counter() - start, response.status_code, len(response.content)
+        )
+        return response
+
+
+def har_api_get(path: str, headers: Dict[str, str]) -> requests.Response:
+    """GET a path on the HAR API (e.g. "/listing?...") over the shared pool."""
+    return http_get(HAR_API_BASE_URL + path, headers)
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport with one connection pool per event loop.
+
+    An httpx pool can only be used from the loop that opened it, so a client
+    built on this transport can be shared by every loop in the process
+    (successive asyncio.run() calls, loops in worker threads). A pool is
+    dropped together with its loop.
+    """
+
+    def __init__(self, **transport_kwargs):
+        self._transport_kwargs = transport_kwargs
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's pool; other loops' pools go with their loops."""
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the process-wide async client, pooled the same way as get_session().
+
+    The client can be used from any event loop; each loop gets its own pool.
+    """
+    global _async_client
+    with _session_lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                transport=LoopLocalTransport(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_ASYNC_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_ASYNC_MAX_KEEPALIVE,
+                    )
+                ),
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            )
+        return _async_client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client and drop its pooled connections."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def ahttp_get(url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """Async http_get: waits for the limiter and the response without holding a thread."""
+    async with get_limiter(urlparse(url).netloc).aslot() as outcome:
+        start = time.perf_counter()
+        try:
+            response = await get_async_client().get(url, headers=headers)
+        except httpx.HTTPError:
+            observe_upstream(url, time.perf_counter() - start, None)
+            raise
+        outcome["status"] = response.status_code
+        observe_upstream(
+            url, time.perf_counter() - start, response.status_code, len(response.content)
+        )
+        return response
+
+
+async def ahar_api_get(path: str, headers: Dict[str, str]) -> httpx.Response:
+    """Async har_api_get."""
+    return await ahttp_get(HAR_API_BASE_URL + path, headers)
@@ -0,0 +1,220 @@
+import functools
+import inspect
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from my_agent.utils.cache import CACHES
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+REGISTRY: List["Metric"] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] += amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # per label set: [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, series in self._values.items():
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+node_latency = Histogram(
+    "har_agent_node_latency_seconds", "Latency of graph nodes", ["node"]
+)
+node_errors = Counter("har_agent_node_errors_total", "Graph node failures", ["node"])
+upstream_latency = Histogram(
+    "har_agent_upstream_latency_seconds", "Latency of upstream HTTP calls", ["endpoint"]
+)
+upstream_errors = Counter(
+    "har_agent_upstream_errors_total",
+    "Upstream HTTP calls that raised or returned an error status",
+    ["endpoint", "status"],
+)
+upstream_response_bytes = Histogram(
+    "har_agent_upstream_response_bytes",
+    "Size of upstream HTTP response bodies",
+    ["endpoint"],
+    buckets=SIZE_BUCKETS,
+)
+cache_hits = Gauge("har_agent_cache_hits", "Cache hits since start", ["cache"])
+cache_misses = Gauge("har_agent_cache_misses", "Cache misses since start", ["cache"])
+cache_hit_ratio = Gauge("har_agent_cache_hit_ratio", "Cache hit ratio since start", ["cache"])
+cache_size = Gauge("har_agent_cache_entries", "Entries held by a cache", ["cache"])
+cache_bytes = Gauge("har_agent_cache_bytes", "Estimated bytes held by a cache", ["cache"])
+
+
+def endpoint_label(url: str) -> str:
+    """Collapse ids out of a URL path, e.g. /chatbot/property/123 -> /chatbot/property/{id}."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", urlparse(url).path) or "/"
+
+
+def observe_upstream(url: str, seconds: float, status: Optional[int], size: int = 0) -> None:
+    endpoint = endpoint_label(url)
+    upstream_latency.observe(seconds, endpoint=endpoint)
+    if status is None or status >= 400:
+        upstream_errors.inc(endpoint=endpoint, status=str(status or "exception"))
+    else:
+        upstream_response_bytes.observe(size, endpoint=endpoint)
+
+
+def instrument_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node so its latency and failures are recorded."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                node_errors.inc(node=name)
+                raise
+            finally:
+                node_latency.observe(time.perf_counter() - start, node=name)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            node_errors.inc(node=name)
+            raise
+        finally:
+            node_latency.observe(time.perf_counter() - start, node=name)
+
+    return wrapper
+
+
+def _collect_caches() -> None:
+    for name, cache in list(CACHES.items()):
+        stats = cache.stats()
+        cache_hits.set(stats["hits"], cache=name)
+        cache_misses.set(stats["misses"], cache=name)
+        cache_hit_ratio.set(stats["hit_ratio"], cache=name)
+        cache_size.set(stats["size"], cache=name)
+        cache_bytes.set(stats["bytes"], cache=name)
+
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    _collect_caches()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics for Prometheus on a background thread."""
+    try:
+        server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    except OSError as e:
+        logging.warning(f"Metrics endpoint not started on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    return server
@@ -0,0 +1,153 @@
+"""Long-lived chat models shared by every graph node.
+
+Each model name is built once per process. The OpenAI models share one
+pooled httpx client pair, so a request reuses a warm keep-alive connection
+instead of opening a new one. A node resolves its model by name from
+GraphConfig: `model_name` for the agent, `parser_model_name` for
+output_parser.
+"""
+import threading
+from typing import Callable, Dict, Hashable, Optional, Sequence
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+from my_agent.utils.http_client import LoopLocalTransport
+from my_agent.utils.models.constants import (
+    LLM_BASE_URL,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE,
+    LLM_MAX_RETRIES,
+    LLM_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+)
+
+DEFAULT_MODEL = "openai"
+
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE)
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+
+def get_llm_http_client() -> httpx.Client:
+    """The pooled client every OpenAI model sends its sync requests through."""
+    global _http_client
+    with _client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+        return _http_client
+
+
+def get_llm_http_async_client() -> httpx.AsyncClient:
+    """The pooled client every OpenAI model sends its async requests through.
+
+    The models outlive any one event loop, so the pool is kept per loop.
+    """
+    global _http_async_client
+    with _client_lock:
+        if _http_async_client is None or _http_async_client.is_closed:
+            _http_async_client = httpx.AsyncClient(
+                transport=LoopLocalTransport(limits=_limits()), timeout=_timeout()
+            )
+        return _http_async_client
+
+
+def _openai(model_name: str) -> Callable[[], BaseChatModel]:
+    def build() -> BaseChatModel:
+        return ChatOpenAI(
+            temperature=0,
+            model_name=model_name,
+            base_url=LLM_BASE_URL,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=get_llm_http_client(),
+            http_async_client=get_llm_http_async_client(),
+        )
+
+    return build
+
+
+def _anthropic(model_name: str) -> Callable[[], BaseChatModel]:
+    def build() -> BaseChatModel:
+        # Imported here so deployments that only use OpenAI never load it
+        from langchain_anthropic import ChatAnthropic
+
+        return ChatAnthropic(
+            temperature=0,
+            model_name=model_name,
+            default_request_timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+        )
+
+    return build
+
+
+MODEL_BUILDERS: Dict[str, Callable[[], BaseChatModel]] = {
+    "openai": _openai("gpt-4o"),
+    "anthropic": _anthropic("claude-3-sonnet-20240229"),
+}
+
+
+class ModelRegistry:
+    """Build each chat model once and hand the same instance to every caller.
+
+    Unknown names fall back to DEFAULT_MODEL. register() installs a ready
+    instance under a name, e.g. a fake model in the benchmarks.
+    """
+
+    def __init__(self, builders: Dict[str, Callable[[], BaseChatModel]]):
+        self._builders = dict(builders)
+        self._models: Dict[str, BaseChatModel] = {}
+        self._bound: Dict[Hashable, Runnable] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> BaseChatModel:
+        if name not in self._builders and name not in self._models:
+            name = DEFAULT_MODEL
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = self._builders[name]()
+        return model
+
+    def with_tools(self, name: str, tools: Sequence) -> Runnable:
+        """`get(name).bind_tools(tools)`, bound once per model and tool set."""
+        key = (name, tuple(tool.name for tool in tools))
+        bound = self._bound.get(key)
+        if bound is None:
+            with self._lock:
+                bound = self._bound.get(key)
+                if bound is None:
+                    bound = self._bound[key] = self.get(name).bind_tools(list(tools))
+        return bound
+
+    def structured(self, name: str, schema) -> Runnable:
+        """`get(name).with_structured_output(schema)`, built once per model and schema."""
+        key = (name, "structured", schema.__name__)
+        runnable = self._bound.get(key)
+        if runnable is None:
+            with self._lock:
+                runnable = self._bound.get(key)
+                if runnable is None:
+                    runnable = self._bound[key] = self.get(name).with_structured_output(schema)
+        return runnable
+
+    def register(self, name: str, model: BaseChatModel) -> None:
+        with self._lock:
+            self._models[name] = model
+            self._bound = {key: value for key, value in self._bound.items() if key[0] != name}
+
+
+registry = ModelRegistry(MODEL_BUILDERS)
@@ -31,3 +31,105 @@ API_CODE_BAD_REQUEST = 400
 API_CODE_NOT_FOUND = 404
 API_SERVER_ERROR = 500
 API_CODE_LIMIT_EXCEEDED = 429
+API_CODE_NOT_MODIFIED = 304
+
+# HTTP transport
+HAR_API_BASE_URL = os.getenv("HAR_API_BASE_URL", "https://api.har.com")
+HAR_WEB_BASE_URL = os.getenv("HAR_WEB_BASE_URL", "https://har.com")  # typeapp lookups
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))  # hosts kept
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # connections per host
+# Async client used by the async graph path, shared by every run on the event loop
+HTTP_ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", "100"))
+HTTP_ASYNC_MAX_KEEPALIVE = int(os.getenv("HTTP_ASYNC_MAX_KEEPALIVE", "20"))
+
+# Concurrent school/community ID resolution before a listing search
+ID_LOOKUP_MAX_WORKERS = int(os.getenv("ID_LOOKUP_MAX_WORKERS", "8"))
+ID_LOOKUP_DEADLINE = float(os.getenv("ID_LOOKUP_DEADLINE", "5"))  # seconds
+
+# Property details fetched concurrently for address candidates and compares
+PROPERTY_CANDIDATES_MAX = int(os.getenv("PROPERTY_CANDIDATES_MAX", "5"))
+PROPERTY_DETAILS_DEADLINE = float(os.getenv("PROPERTY_DETAILS_DEADLINE", "8"))  # seconds
+
+# Per-harid property detail cache; sold/expired listings stay fresh longer.
+# Entries are kept PROPERTY_DETAIL_REVALIDATE_TTL past freshness so their
+# ETag/Last-Modified can be revalidated instead of refetched.
+PROPERTY_DETAIL_CACHE_MAXSIZE = int(os.getenv("PROPERTY_DETAIL_CACHE_MAXSIZE", "2048"))
+PROPERTY_DETAIL_CACHE_MAX_BYTES = int(
+    os.getenv("PROPERTY_DETAIL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+PROPERTY_DETAIL_TTL = int(os.getenv("PROPERTY_DETAIL_TTL", "300"))
+PROPERTY_DETAIL_CLOSED_TTL = int(os.getenv("PROPERTY_DETAIL_CLOSED_TTL", str(TTL_ONE_DAY)))
+PROPERTY_DETAIL_REVALIDATE_TTL = int(
+    os.getenv("PROPERTY_DETAIL_REVALIDATE_TTL", str(TTL_ONE_DAY))
+)
+
+# School / community ID lookup cache
+ID_CACHE_MAXSIZE = int(os.getenv("ID_CACHE_MAXSIZE", "2048"))
+ID_CACHE_TTL = int(os.getenv("ID_CACHE_TTL", str(7 * TTL_ONE_DAY)))
+ID_CACHE_NEGATIVE_TTL = int(os.getenv("ID_CACHE_NEGATIVE_TTL", "3600"))  # not found
+
+# /listing and /sold result cache (stale-while-revalidate)
+LISTING_CACHE_MAXSIZE = int(os.getenv("LISTING_CACHE_MAXSIZE", "512"))
+LISTING_CACHE_TTL = int(os.getenv("LISTING_CACHE_TTL", "60"))
+LISTING_CACHE_STALE_TTL = int(os.getenv("LISTING_CACHE_STALE_TTL", "300"))
+
+# Per-thread "show more" pagination cursors
+PAGINATION_CURSOR_MAXSIZE = int(os.getenv("PAGINATION_CURSOR_MAXSIZE", "10000"))
+PAGINATION_PREFETCH_WORKERS = int(os.getenv("PAGINATION_PREFETCH_WORKERS", "4"))
+
+# Full withdrawn / terminated / expired lists, sliced per page client-side
+STATUS_LIST_CACHE_MAXSIZE = int(os.getenv("STATUS_LIST_CACHE_MAXSIZE", "64"))
+STATUS_LIST_CACHE_MAX_BYTES = int(os.getenv("STATUS_LIST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+STATUS_LIST_CACHE_TTL = int(os.getenv("STATUS_LIST_CACHE_TTL", "1800"))
+
+# Tool calls from one agent turn run concurrently, at most this many at once
+TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+
+# Prompt history sent to the agent model is compacted to stay under this many tokens
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", str(TOKEN_THRESHOLD)))
+
+# Tool results sent back to the model are projected and long text truncated
+PROJECTION_TEXT_LIMIT = int(os.getenv("PROJECTION_TEXT_LIMIT", "300"))
+PROJECTION_LIST_LIMIT = int(os.getenv("PROJECTION_LIST_LIMIT", "10"))
+
+# Prometheus scrape endpoint; disabled unless a port is set
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Adaptive (AIMD) concurrency limit per upstream host
+LIMITER_INITIAL_LIMIT = int(os.getenv("LIMITER_INITIAL_LIMIT", "8"))
+LIMITER_MIN_LIMIT = int(os.getenv("LIMITER_MIN_LIMIT", "1"))
+# Never above the pool size, so limited callers always find a pooled connection
+LIMITER_MAX_LIMIT = min(int(os.getenv("LIMITER_MAX_LIMIT", "16")), HTTP_POOL_MAXSIZE)
+LIMITER_MAX_WAIT = float(os.getenv("LIMITER_MAX_WAIT", "10"))  # seconds queued
+LIMITER_MAX_QUEUE = int(os.getenv("LIMITER_MAX_QUEUE", "256"))
+LIMITER_LATENCY_TOLERANCE = float(os.getenv("LIMITER_LATENCY_TOLERANCE", "2.0"))
+
+# Graph checkpointer: "" keeps the LangGraph server's own store,
+# "redis" persists threads in REDIS_URL, "memory" uses an in-process fake Redis
+CHECKPOINTER = os.getenv("CHECKPOINTER", "")
+
+# Build models, HTTP pools and lookup tables when the graph module is imported
+WARMUP_ON_IMPORT = os.getenv("WARMUP_ON_IMPORT", "").lower() in ("1", "true", "yes")
+WARMUP_MODELS = [m for m in os.getenv("WARMUP_MODELS", "openai").split(",") if m]
+
+# Refuse fair-housing violations and off-topic messages locally, before the agent model
+PRESCREEN_ENABLED = os.getenv("PRESCREEN_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Send messages that are only an MLS number, HAR ID or street address straight to the tool
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# Chat models: one long-lived instance per model name, shared by every node.
+# OPENAI_BASE_URL points the OpenAI models at any OpenAI-compatible endpoint.
+AGENT_MODEL = os.getenv("AGENT_MODEL", "openai")
+PARSER_MODEL = os.getenv("PARSER_MODEL", "openai")
+LLM_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # seconds
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+
+# output_parser asks the provider for the Answer through native structured
+# output instead of pasting the schema into the prompt
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "").lower() in ("1", "true", "yes")
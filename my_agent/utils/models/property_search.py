@@ -54,7 +54,11 @@ class PropertySearchFields(BaseModel):
     )
     start: Optional[int] = Field(
         None,
-        description=f"Starting index for fetching property listings. Increment by {DEFAULT_MAX_LISTINGS} EACH time more listings are requested (i.e 5, 10, 15, 20,...)",
+        description=f"Starting index for fetching property listings (i.e 5, 10, 15, 20,...). For show more use next_page instead.",
+    )
+    next_page: Optional[bool] = Field(
+        None,
+        description="Set to True, with no other filters, when the user asks to show more / the next page of the previous search results",
     )
     days_on_market_min: Optional[int] = Field(
         None, description="Minimum number of days on market"
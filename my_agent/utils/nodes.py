@@ -1,43 +1,121 @@
-from functools import lru_cache
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
+import logging
+import uuid
 from my_agent.utils.tools import tools, search_agent, search_properties, search_properties_by_address
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import StateGraph, END
-from my_agent.utils.parser import Answer, get_schema
-from langchain_core.messages import HumanMessage
+from my_agent.utils.parser import Answer, get_schema, get_answer_model, answer_to_json, render_answer
+import openai
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage, HumanMessage
+from my_agent.utils.cards import build_search_answer, tool_payload
+from my_agent.utils.models.constants import TOOL_MAX_CONCURRENCY, HISTORY_TOKEN_BUDGET, PRESCREEN_ENABLED, ROUTER_ENABLED, AGENT_MODEL, PARSER_MODEL, STRUCTURED_OUTPUT
+from my_agent.utils.model_registry import registry
+from my_agent.utils.prescreen import FAIR_HOUSING_REFUSAL, OFF_TOPIC_REFUSAL, screen, refusal
+from my_agent.utils.router import route
+from my_agent.utils.metrics import Counter
+from my_agent.utils.history import aload_encoding, compact_history, count_tokens
+from my_agent.utils.state import trailing_tool_messages
 flag= False
 
-tool_node1 = ToolNode([search_properties])
-tool_node2 = ToolNode([search_agent])
-tool_node3 = ToolNode([search_properties_by_address])
-@lru_cache(maxsize=4)
+tool_node = ToolNode([search_agent, search_properties, search_properties_by_address])
+
+
+def call_tools(state, config):
+    """Run every tool call of the last AI message concurrently."""
+    return tool_node.invoke(state, {**config, "max_concurrency": TOOL_MAX_CONCURRENCY})
+
+
+async def acall_tools(state, config):
+    """Async call_tools: the tool calls run as tasks on the event loop."""
+    return await tool_node.ainvoke(state, {**config, "max_concurrency": TOOL_MAX_CONCURRENCY})
+
+AGENT_TOOLS = [search_agent, search_properties, search_properties_by_address]
+
+
 def _get_model(model_name: str):
-    if model_name == "openai":
-        model = ChatOpenAI(temperature=0, model_name="gpt-4o")
-    elif model_name == "anthropic":
-        model =  ChatAnthropic(temperature=0, model_name="claude-3-sonnet-20240229")
-    else:
-        model = ChatOpenAI(temperature=0, model_name="gpt-4o")
-        # raise ValueError(f"Unsupported model type: {model_name}")
+    """The shared agent model for `model_name`, with the tools bound."""
+    return registry.with_tools(model_name, AGENT_TOOLS)
+
+
+def _get_parser_model(config):
+    """The shared output_parser model chosen by `parser_model_name`."""
+    return registry.get(config.get("configurable", {}).get("parser_model_name", PARSER_MODEL))
+
+prescreen_verdicts = Counter(
+    "har_agent_prescreen_total", "Messages refused by the local pre-screen", ["verdict"]
+)
+
+
+def prescreen(state, config):
+    """Answer fair-housing violations and off-topic messages with the canned refusal."""
+    if not config.get("configurable", {}).get("prescreen", PRESCREEN_ENABLED):
+        return {"messages": []}
+    last_message = state["messages"][-1]
+    if not isinstance(last_message, HumanMessage):
+        return {"messages": []}
+    verdict = screen(message_text(last_message))
+    if verdict is None:
+        return {"messages": []}
+    prescreen_verdicts.inc(verdict=verdict)
+    return {"messages": [AIMessage(content=render_answer(refusal(verdict)))]}
+
+
+async def aprescreen(state, config):
+    # Pure CPU and microseconds; no need to leave the event loop
+    return prescreen(state, config)
+
+
+def after_prescreen(state):
+    """END when the pre-screen answered, otherwise on to the router."""
+    if isinstance(state["messages"][-1], AIMessage):
+        return END
+    return "router"
+
+
+router_decisions = Counter(
+    "har_agent_router_total", "Messages routed to a tool without an agent model call", ["tool"]
+)
+
+
+def route_message(state, config):
+    """Build the tool call for an MLS number, HAR ID or address without the model."""
+    if not config.get("configurable", {}).get("router", ROUTER_ENABLED):
+        return {"messages": []}
+    last_message = state["messages"][-1]
+    if not isinstance(last_message, HumanMessage):
+        return {"messages": []}
+    call = route(message_text(last_message))
+    if call is None:
+        return {"messages": []}
+    router_decisions.inc(tool=call["name"])
+    tool_call = {**call, "id": f"call_{uuid.uuid4().hex[:24]}"}
+    return {"messages": [AIMessage(content="", tool_calls=[tool_call])]}
+
+
+async def aroute_message(state, config):
+    return route_message(state, config)
+
+
+def after_router(state):
+    """Run the routed tool call, or let the agent model decide."""
+    if isinstance(state["messages"][-1], AIMessage):
+        return "tools"
+    return "agent"
 
-    # model = model.bind_tools([])
-    model = model.bind_tools([search_agent,search_properties, search_properties_by_address])
-    return model
 
 # Define the function that determines whether to continue or not
 def should_continue(state):
     messages = state["messages"]
     last_message = messages[-1]
-    # If there are no tool calls, then we finish
-    if not last_message.tool_calls:           
-        return "output_parser"
-    # # Otherwise if there is, we continue
+    # If there are no tool calls, call_model already wrapped the answer
+    if not last_message.tool_calls:
+        return END
+    # Otherwise run all requested tools together
     else:
-        return last_message.tool_calls[0]["name"]
+        return "tools"
 
 
-system_prompt = """
+system_prompt = f"""
 Be a helpful assistant of HAR.com
 
 Please review the property description for any language that may violate fair housing laws. Focus on identifying terms that could discriminate based on:
@@ -51,7 +129,7 @@ Please review the property description for any language that may violate fair ho
     7. **Other** (e.g., 'no smokers,' 'must be employed')
 
 Flag any potentially discriminatory terms and Respond with following:
-'I'm sorry, but I cannot assist with this request as it may conflict with the Fair Housing Act, which ensures equal housing opportunities and prohibits discrimination based on race, color, religion, sex, disability, familial status, or national origin. HAR support the Fair Housing Act [[https://www.justice.gov/crt/fair-housing-act-1]], which protects everyone's right to equal housing opportunities. To learn more visit https://www.justice.gov/crt/fair-housing-act-1.'
+'{FAIR_HOUSING_REFUSAL}'
 
  RESPONSE GUIDELINES:
     - Address HAR.com-related queries with priority
@@ -71,41 +149,154 @@ Flag any potentially discriminatory terms and Respond with following:
         • Legal advice or interpretations
         • **Non-real estate topics**
         • Personal opinions about market trends
-    - [IMPORTANT] - For non-property related questions [or gibberish]: I can only assist with questions about HAR.com property listings and services. How can I help you find properties on HAR.com?
+    - [IMPORTANT] - For non-property related questions [or gibberish]: {OFF_TOPIC_REFUSAL}
                     
 """
 
 # Define the function that calls the model
 def call_model(state, config):
-    messages = state["messages"]
-    messages = [{"role": "system", "content": system_prompt}] + messages
-    model_name = config.get('configurable', {}).get("model_name", "openai")
-    model = _get_model(model_name)
+    model, messages = _agent_request(state, config)
     response = model.invoke(messages)
+    return _agent_result(response)
+
+
+async def acall_model(state, config):
+    await aload_encoding()
+    model, messages = _agent_request(state, config)
+    response = await model.ainvoke(messages)
+    return _agent_result(response)
+
+
+def _agent_request(state, config):
+    """Return the agent model and the messages to send it."""
+    budget = config.get("configurable", {}).get("history_token_budget", HISTORY_TOKEN_BUDGET)
+    messages = compact_history(state["messages"], budget - count_tokens(system_prompt))
+    messages = [{"role": "system", "content": system_prompt}] + messages
+    model_name = config.get('configurable', {}).get("model_name", AGENT_MODEL)
+    return _get_model(model_name), messages
+
+
+def _agent_result(response):
+    # A plain-text answer needs no output_parser call; wrap it here and finish
+    if not response.tool_calls:
+        response = AIMessage(content=render_answer(message_text(response)), id=response.id)
     # We return a list, because this will get added to the existing list
     return {"messages": [response]}
 
+def message_text(message) -> str:
+    """Return the text of a message whose content may be a list of parts."""
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in message.content
+    )
+
 def output_parser(state, config):
+    shortcut = _parser_shortcut(state)
+    if shortcut is not None:
+        return shortcut
+    if _structured_output(config):
+        try:
+            answer = _get_structured_parser(state, config).invoke(_parser_messages(state, structured=True))
+        except STRUCTURED_OUTPUT_ERRORS as e:
+            logging.warning(f"Structured output failed, falling back to the prompt schema: {e}")
+            answer = None
+        # None when the model answered without filling in the schema
+        if answer is not None:
+            return {"messages": [AIMessage(content=answer_to_json(answer))]}
+    messages = _parser_messages(state)
+    model = _get_parser_model(config)
+    response = model.invoke(messages)
+    # We return a list, because this will get added to the existing list
+    return {"messages": [response]}
+
+
+async def aoutput_parser(state, config):
+    shortcut = _parser_shortcut(state)
+    if shortcut is not None:
+        return shortcut
+    if _structured_output(config):
+        try:
+            answer = await _get_structured_parser(state, config).ainvoke(
+                _parser_messages(state, structured=True)
+            )
+        except STRUCTURED_OUTPUT_ERRORS as e:
+            logging.warning(f"Structured output failed, falling back to the prompt schema: {e}")
+            answer = None
+        if answer is not None:
+            return {"messages": [AIMessage(content=answer_to_json(answer))]}
+    messages = _parser_messages(state)
+    model = _get_parser_model(config)
+    response = await model.ainvoke(messages)
+    return {"messages": [response]}
+
+
+# Structured output failures that the prompt-schema call can still answer: a
+# malformed answer (OutputParserException, pydantic ValidationError), a model
+# without with_structured_output, or the provider rejecting the strict schema
+STRUCTURED_OUTPUT_ERRORS = (
+    OutputParserException,
+    ValueError,
+    NotImplementedError,
+    openai.BadRequestError,
+    openai.UnprocessableEntityError,
+)
+
+
+def _structured_output(config) -> bool:
+    return config.get("configurable", {}).get("structured_output", STRUCTURED_OUTPUT)
+
+
+def _get_structured_parser(state, config):
+    """The parser model returning the turn's Answer variant via native structured output."""
+    model_name = config.get("configurable", {}).get("parser_model_name", PARSER_MODEL)
+    return registry.structured(model_name, get_answer_model(state))
+
+
+def _parser_shortcut(state):
+    tool_messages = trailing_tool_messages(state["messages"])
+    # Property results map 1:1 onto PropertyCard, so no model call is needed
+    if tool_messages and all(m.name == "search_properties" for m in tool_messages):
+        answer = build_search_answer(tool_messages)
+        if answer is not None:
+            return {"messages": [AIMessage(content=answer)]}
+    return None
+
+
+def _parser_messages(state, structured: bool = False):
+    """Build the extraction prompt and tool results for the parser model.
+
+    With `structured` the provider enforces the Answer schema, so the prompt
+    leaves it out.
+    """
     messages = state["messages"]
-    Schema = get_schema(state)
-    # print(messages)
+    tool_messages = trailing_tool_messages(messages)
+
+    if structured:
+        instruction = "and fill in the answer with only relevant fields."
+    else:
+        instruction = f"and create a JSON object with only relevant fields from the following schema:  {get_schema(state)}"
     for message in reversed(messages):
         if isinstance(message, HumanMessage):
             question = message.content.strip()
             break
     
-    print(state["messages"][-1].name)
     card = None
     if (state["messages"][-1].name=="search_by_properties"):
         card ="whole property"
     prompt =f"""
-        Be a helpful assistant and Extract the event information from last ai message. and create a JSON object with only relevant fields from the following schema:  {Schema}
+        Be a helpful assistant and Extract the event information from last ai message. {instruction}
         Card field should be None if the answer is not directly related to Agent ,{card} or School.
         If Card is None, pretext should contain all information to answer the user query ** {question} **.
     """
-    messages = [{"role": "system", "content":  prompt}] + [messages[-1].content]
-    print(messages)
-    model = ChatOpenAI(temperature=0, model_name="gpt-4o")
-    response = model.invoke(messages)
-    # We return a list, because this will get added to the existing list
-    return {"messages": [response]}
+    # Merge the full results of every tool that ran in this turn
+    if len(tool_messages) > 1:
+        content = "\n\n".join(f"{m.name} result: {tool_payload(m)}" for m in tool_messages)
+    elif tool_messages:
+        content = tool_payload(tool_messages[0])
+    else:
+        content = messages[-1].content
+    messages = [{"role": "system", "content":  prompt}] + [content]
+    logging.debug(f"Parser prompt: {messages}")
+    return messages
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set, Tuple
+
+from my_agent.utils.async_tool_utils import asearch_listings, asearch_status_list
+from my_agent.utils.cache import MISSING, TTLCache
+from my_agent.utils.models.constants import (
+    DEFAULT_MAX_LISTINGS,
+    TTL_ONE_DAY,
+    PAGINATION_CURSOR_MAXSIZE,
+    PAGINATION_PREFETCH_WORKERS,
+)
+from my_agent.utils.tool_utils import (
+    STATUS_LIST_KEYS,
+    build_listing_path,
+    canonical_query_key,
+    search_listings,
+    search_status_list,
+)
+
+# A cursor is the compiled listing query of the last page served on a thread:
+# {"path", "payload", "availablity", "user_id", "member_number", "role", "islogin"}
+# where payload["start"] is the position of that page. The store is per
+# process: with several workers, "show more" only continues a search served
+# by the same worker, and elsewhere the tool asks for the filters again.
+cursor_store = TTLCache(PAGINATION_CURSOR_MAXSIZE, TTL_ONE_DAY, name="pagination_cursor")
+
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=PAGINATION_PREFETCH_WORKERS, thread_name_prefix="page-prefetch"
+)
+_prefetch_tasks: Set[asyncio.Task] = set()
+
+
+def get_cursor(thread_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not thread_id:
+        return None
+    cursor = cursor_store.get(thread_id)
+    return None if cursor is MISSING else cursor
+
+
+def save_cursor(thread_id: Optional[str], cursor: Dict[str, Any]) -> None:
+    if thread_id:
+        cursor_store.set(thread_id, cursor)
+
+
+def page_bounds(cursor: Dict[str, Any]) -> Tuple[int, int]:
+    """Return (start, page size) of the page a cursor points at."""
+    payload = cursor["payload"]
+    return int(payload.get("start") or 0), int(payload.get("max") or DEFAULT_MAX_LISTINGS)
+
+
+def advance_cursor(cursor: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of the cursor moved forward by one page."""
+    start, limit = page_bounds(cursor)
+    return {**cursor, "payload": {**cursor["payload"], "start": start + limit}}
+
+
+def fetch_page(
+    cursor: Dict[str, Any], bypass_cache: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    availablity = cursor["availablity"]
+    status_key = STATUS_LIST_KEYS.get(availablity[0]) if availablity else None
+    if status_key:
+        status_list, status_code = search_status_list(
+            cursor["path"],
+            cursor["payload"],
+            status_key,
+            cursor["user_id"],
+            cursor["member_number"],
+            cursor["role"],
+            bypass_cache,
+        )
+        return {status_key: status_list}, status_code
+
+    fullpath = build_listing_path(cursor["path"], cursor["payload"])
+    cache_key = canonical_query_key(
+        cursor["path"], cursor["payload"], cursor["user_id"], cursor["role"]
+    )
+    return search_listings(
+        fullpath,
+        cache_key,
+        cursor["user_id"],
+        cursor["member_number"],
+        cursor["role"],
+        bypass_cache,
+    )
+
+
+def prefetch_page(cursor: Dict[str, Any]) -> None:
+    """Warm the listing cache with the page a cursor points at, in the background."""
+
+    def prefetch():
+        try:
+            fetch_page(cursor)
+        except Exception as e:
+            logging.warning(f"Prefetch of {cursor['path']} failed: {e}")
+
+    _prefetch_executor.submit(prefetch)
+
+
+async def afetch_page(
+    cursor: Dict[str, Any], bypass_cache: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    """Async fetch_page."""
+    availablity = cursor["availablity"]
+    status_key = STATUS_LIST_KEYS.get(availablity[0]) if availablity else None
+    if status_key:
+        status_list, status_code = await asearch_status_list(
+            cursor["path"],
+            cursor["payload"],
+            status_key,
+            cursor["user_id"],
+            cursor["member_number"],
+            cursor["role"],
+            bypass_cache,
+        )
+        return {status_key: status_list}, status_code
+
+    return await asearch_listings(
+        build_listing_path(cursor["path"], cursor["payload"]),
+        canonical_query_key(
+            cursor["path"], cursor["payload"], cursor["user_id"], cursor["role"]
+        ),
+        cursor["user_id"],
+        cursor["member_number"],
+        cursor["role"],
+        bypass_cache,
+    )
+
+
+def aprefetch_page(cursor: Dict[str, Any]) -> None:
+    """prefetch_page for the event loop: the prefetch runs as a task."""
+
+    async def prefetch():
+        try:
+            await afetch_page(cursor)
+        except Exception as e:
+            logging.warning(f"Prefetch of {cursor['path']} failed: {e}")
+
+    task = asyncio.ensure_future(prefetch())
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
@@ -3,6 +3,7 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.pydantic_v1 import BaseModel, Field, root_validator
 from langchain_openai import ChatOpenAI
 from typing import List, Optional, Dict, Union
+from my_agent.utils.state import trailing_tool_messages
 # Define your desired data structure.
 
 class PropertyCard(BaseModel):
@@ -61,29 +62,82 @@ class Answer(BaseModel):
     pretext: str = Field(description="Textual Response, should be detailed if the card is gonna be null")
     Card: Optional[List[Union[PropertyCard, SchoolCard,AgentCard]]] = Field(description="JSON object with all the details that will be used to render the card")
 
-from copy import deepcopy
+
+# Answer for turns with only search_properties_by_address results (or no tool), which show no property cards
+class AnswerWithoutProperty(BaseModel):
+    pretext: str = Field(description="Textual Response, should be detailed if the card is gonna be null")
+    Card: Optional[List[Union[SchoolCard,AgentCard]]] = Field(description="JSON object with all the details that will be used to render the card")
+
+import json
+
+
+def render_answer(pretext: str, cards: Optional[List[dict]] = None) -> str:
+    """Serialize an answer in the `Answer` shape returned to the client."""
+    return json.dumps({"pretext": pretext, "Card": cards or None}, ensure_ascii=False)
+
+
+JSON_TYPES = {"string": "str", "number": "float", "integer": "int", "boolean": "bool"}
+
+
+def _compact_type(prop: Dict) -> str:
+    if "$ref" in prop:
+        return prop["$ref"].rsplit("/", 1)[-1]
+    if "anyOf" in prop:
+        return "|".join(_compact_type(p) for p in prop["anyOf"])
+    if prop.get("type") == "array":
+        return f"list[{_compact_type(prop['items'])}]"
+    return JSON_TYPES.get(prop.get("type"), "any")
+
+
+def _compact_object(name: str, schema: Dict) -> str:
+    required = set(schema.get("required", []))
+    fields = []
+    for field, prop in schema["properties"].items():
+        text = f"{field}:{_compact_type(prop)}"
+        if field not in required:
+            text += "|null"
+        if prop.get("description"):
+            text += f' "{prop["description"]}"'
+        fields.append(text)
+    return f"{name}{{{', '.join(fields)}}}"
+
+
+def compact_schema(model) -> str:
+    """Render a model as one `Name{field:type, ...}` line per object.
+
+    Carries the same fields, types and descriptions as the JSON Schema in a
+    fraction of the prompt tokens. The root object is always called Answer.
+    """
+    schema = model.schema()
+    lines = [_compact_object("Answer", schema)]
+    for name, definition in schema.get("definitions", {}).items():
+        lines.append(_compact_object(name, definition))
+    return "\n".join(lines)
+
+
+# Both variants are rendered once at import instead of on every output_parser run
+ANSWER_SCHEMA = compact_schema(Answer)
+ANSWER_SCHEMA_WITHOUT_PROPERTY = compact_schema(AnswerWithoutProperty)
+
+
+def get_answer_model(state):
+    """Determine the Answer model based on the tools that ran this turn."""
+    tool_names = {message.name for message in trailing_tool_messages(state.get("messages", []))}
+    if state.get("messages") and tool_names <= {"search_properties_by_address", None}:
+        return AnswerWithoutProperty
+    return Answer
+
 
 def get_schema(state):
-    """Determine the appropriate schema based on the last message's name."""
-    
-    base_schema = Answer.schema(ref_template="{model}")  # Get the full schema
-    
-    if state.get("messages") and state["messages"][-1].name in {"search_properties_by_address", None}:
-        schema_copy = deepcopy(base_schema)  # Use deepcopy to avoid modifying the original
-        
-        # Remove PropertyCard from "Card" field
-        schema_copy["properties"]["Card"]["items"]["anyOf"] = [
-            {"$ref": "#/definitions/SchoolCard"},
-            {"$ref": "#/definitions/AgentCard"},
-        ]
-        
-        # Remove PropertyCard from definitions
-        schema_copy["definitions"].pop("PropertyCard", None)
-        
-        return schema_copy
-    
-    return base_schema  # Default schema
-# Return the original schema if no filtering is needed
+    """The precomputed compact schema matching get_answer_model(state)."""
+    if get_answer_model(state) is AnswerWithoutProperty:
+        return ANSWER_SCHEMA_WITHOUT_PROPERTY
+    return ANSWER_SCHEMA
+
+
+def answer_to_json(answer) -> str:
+    """Serialize an Answer (either variant) returned by structured output."""
+    return render_answer(answer.pretext, [card.dict() for card in answer.Card or []])
 
 parser = JsonOutputParser(pydantic_object=Answer)
 
@@ -0,0 +1,167 @@
+"""Local pre-screen for fair-housing violations and off-topic messages.
+
+The refusals in `system_prompt` are fixed strings, so a message that clearly
+calls for one is answered here, before the agent model is called. All the
+fair-housing and off-topic patterns are compiled into one regex with a named
+group per category, and a single scan classifies a message.
+
+The screen favours precision: it only refuses unambiguous phrasing. Anything
+it lets through still reaches the model, which applies the same rules from
+`system_prompt`.
+"""
+import re
+from typing import Dict, List, Optional
+
+FAIR_HOUSING_REFUSAL = (
+    "I'm sorry, but I cannot assist with this request as it may conflict with the Fair Housing Act, "
+    "which ensures equal housing opportunities and prohibits discrimination based on race, color, "
+    "religion, sex, disability, familial status, or national origin. HAR support the Fair Housing Act "
+    "[[https://www.justice.gov/crt/fair-housing-act-1]], which protects everyone's right to equal "
+    "housing opportunities. To learn more visit https://www.justice.gov/crt/fair-housing-act-1."
+)
+OFF_TOPIC_REFUSAL = (
+    "I can only assist with questions about HAR.com property listings and services. "
+    "How can I help you find properties on HAR.com?"
+)
+
+_PEOPLE = r"(?:people|folks|persons?|residents?|neighbou?rs?|neighbou?rhoods?|famil(?:y|ies)|tenants?|buyers?|areas?|communit(?:y|ies)|kids|children)"
+_EXCLUDE = r"(?:(?:no|without|fewer|few|less|not)(?:\s+(?:many|any|more))?|away\s+from|far\s+from|free\s+of|avoid(?:ing)?|keep\s+out|only|all|mostly|predominantly|majority)"
+_COLORS = r"(?:black|white|brown|colou?red)"
+_ORIGINS = (
+    r"(?:african[- ]american|hispanic|latino|latinx|mexican|asian|chinese|indian|arab|"
+    r"middle[- ]eastern|immigrant|foreigner|minority|minorities|caucasian|vietnamese|nigerian)s?"
+)
+_RACES = rf"(?:{_COLORS}|{_ORIGINS})"
+_RELIGIONS = r"(?:christian|jewish|jew|muslim|islamic|catholic|hindu|sikh|buddhist|mormon|atheist)s?"
+_WORSHIP = r"(?:mosques?|synagogues?|churche?s?|temples?|gurdwaras?)"
+
+# Fair-housing categories of system_prompt, in its order
+FAIR_HOUSING_PATTERNS: Dict[str, List[str]] = {
+    "family_status": [
+        r"(?:ideal|perfect|great|best)\s+for\s+(?:a\s+)?(?:couples?|singles?|empty[- ]nesters?)\b(?!\s+(?:family|story|level|businessm[ae]n|m[ae]n|wom[ae]n|ladies|guys|girls))",
+        r"\bno\s+(?:kids|children|babies|toddlers|families|teenagers|teens)\b"
+        r"(?=\s*(?:allowed|permitted|please|around|nearby|in\s+the\s+(?:building|complex|community|neighbou?rhood)|[.,;!?]|$))",
+        r"\b(?:without|free\s+of)\s+(?:any\s+)?(?:kids|children|families)\s+(?:around|nearby|next\s+door)",
+        r"\badults?[- ]only\b",
+        r"\bchild[- ]?free\s+(?:neighbou?rhood|building|community|area|complex)",
+        r"\bnot\s+(?:suitable|for)\s+(?:kids|children|families)\b",
+    ],
+    "race_national_origin": [
+        rf"\b{_EXCLUDE}\s+(?:\w+\s+){{0,2}}?{_RACES}\s+{_PEOPLE}",
+        rf"\b{_EXCLUDE}\s+{_ORIGINS}\b(?!\s+(?:restaurants?|food|cuisine|markets?|grocer(?:y|ies)|stores?))",
+        rf"\b{_RACES}\s+(?:neighbou?rhood|area|community|part\s+of\s+town)\b(?!\s+(?:cent(?:er|re)|college|church))",
+        r"\b(?:racially|ethnically)\s+(?:homogeneous|pure|white)\b",
+        r"\b(?:no|without)\s+(?:immigrants|foreigners|minorities)\b",
+        r"\bamericans?\s+only\b|\benglish[- ]speakers?\s+only\b",
+    ],
+    "religion": [
+        rf"\b{_RELIGIONS}\s+(?:only|neighbou?rhood|area|community|families|neighbou?rs|people)\b"
+        # A place named for a religion, or a reference point for directions
+        r"(?!\s+(?:cent(?:er|re)|college|church|school|from|to)\b)",
+        rf"\b(?:no|without|away\s+from|far\s+from|avoid(?:ing)?)\s+(?:any\s+)?{_WORSHIP}",
+        rf"\b(?:no|without|away\s+from|far\s+from|avoid(?:ing)?)\s+(?:any\s+)?{_RELIGIONS}\b",
+    ],
+    "sex": [
+        r"\bbachelor(?:ette)?\s+pad\b",
+        r"(?:ideal|perfect|great|best|only)\s+for\s+(?:a\s+)?(?:(?:single\s+)?(?:businessm[ae]n|m[ae]n|wom[ae]n|males?|females?|ladies|gentlemen|guys|girls))\b(?!\s+caves?)",
+        r"\b(?:m[ae]n|wom[ae]n|males?|females?|ladies|gentlemen)\s+only\b",
+        r"\bno\s+(?:m[ae]n|wom[ae]n|males?|females?|ladies|gentlemen)\b(?!\s+caves?)",
+    ],
+    "disability": [
+        r"must\s+be\s+able\s+to\s+(?:climb|walk|use\s+stairs|see|hear)",
+        r"\bno\s+(?:wheelchairs|disabled|handicapped|service\s+animals|mentally\s+ill)\b(?!\s+(?:access|parking|ramps?|bathrooms?))",
+        r"\bnot\s+(?:for|suitable\s+for)\s+(?:the\s+)?(?:disabled|handicapped)\b",
+        r"\b(?:able[- ]bodied|physically\s+fit)\s+(?:only|tenants|buyers|residents|people)\b",
+    ],
+    "age": [
+        r"(?:ideal|perfect|great|best)\s+for\s+(?:a\s+)?(?:retirees|seniors|elderly|young\s+(?:professionals|people|couples))",
+        r"\b(?:no|without)\s+(?:old|older|elderly|senior|young)\s+(?:people|folks|residents|neighbou?rs|tenants)\b",
+        r"\b(?:no|without)\s+(?:retirees|seniors|elderly|millennials)\b",
+        r"\byoung\s+(?:people|professionals)\s+only\b",
+    ],
+    "other": [
+        r"\bno\s+smokers\b",
+        r"\bmust\s+be\s+employed\b",
+        r"\bno\s+(?:section\s*8|vouchers|welfare|unemployed)\b",
+    ],
+}
+
+# Requests that are plainly not about real estate
+OFF_TOPIC_PATTERNS: List[str] = [
+    r"\b(?:weather|forecast)\s+(?:today|tomorrow|tonight|this\s+week(?:end)?)\b",
+    r"\brecipes?\b|\bhow\s+(?:do\s+i|to)\s+(?:cook|bake)\b",
+    r"\bwrite\s+(?:me\s+)?(?:a|an)\s+(?:poem|story|essay|song|haiku|limerick)\b",
+    r"\btell\s+me\s+a\s+joke\b",
+    r"\bwho\s+won\s+(?:the\s+)?(?:game|match|super\s*bowl|world\s+series|election)\b",
+    r"\bcapital\s+of\s+[a-z]+",
+    r"\btranslate\s+.+\s+(?:into|to)\s+[a-z]+",
+    r"\b(?:bitcoin|crypto(?:currency)?|stock)\s+price\b",
+    r"\b(?:write|debug|fix)\s+(?:my\s+|some\s+|this\s+)?(?:python|javascript|java|sql|code)\b",
+    r"\bmovie\s+(?:recommendations?|to\s+watch)\b|\bwhat\s+should\s+i\s+watch\b",
+    r"^\s*(?:what\s+is|what's|calculate|compute|solve|evaluate)\s+\d+(?:\.\d+)?\s*"
+    r"(?:[-+*/x]|plus|minus|times|divided\s+by)\s*\d+(?:\.\d+)?\s*\??\s*$",
+]
+
+# Any of these means the message is about real estate, so it is never off-topic
+REAL_ESTATE_TERMS = re.compile(
+    r"\b(?:homes?|houses?|propert(?:y|ies)|listings?|real\s+estate|realtors?|agents?|har|mls|"
+    r"condos?|townhouses?|townhomes?|apartments?|lots?|acres?|land|beds?|bedrooms?|baths?|"
+    r"bathrooms?|sq\s*ft|square\s+feet|mortgage|hoa|rent(?:al)?s?|lease|buy(?:ing)?|sell(?:ing)?|"
+    r"for\s+sale|neighbou?rhoods?|communit(?:y|ies)|schools?|isd|zip|subdivisions?|"
+    r"garage|pool|yard|kitchen|move|moving|relocat\w*)\b",
+    re.IGNORECASE,
+)
+
+SCREEN = re.compile(
+    "|".join(
+        [f"(?P<{name}>{'|'.join(patterns)})" for name, patterns in FAIR_HOUSING_PATTERNS.items()]
+        + [f"(?P<off_topic>{'|'.join(OFF_TOPIC_PATTERNS)})"]
+    ),
+    re.IGNORECASE,
+)
+
+_WORD = re.compile(r"[a-z]+", re.IGNORECASE)
+_KEYBOARD_RUNS = re.compile(r"asdf|sdfg|qwer|wert|zxcv|hjkl|jkl;|uiop|dfgh|fghj", re.IGNORECASE)
+_REPEATED = re.compile(r"(.)\1{3,}")
+_VOWELS = set("aeiouyAEIOUY")
+
+
+def is_gibberish(text: str) -> bool:
+    """True for keyboard mashing: most words are unpronounceable or repeated runs."""
+    if any(ch.isdigit() for ch in text):
+        return False  # MLS numbers, HAR IDs, prices and addresses
+    words = _WORD.findall(text)
+    if not words or sum(len(w) for w in words) < 5:
+        return False
+    junk = 0
+    for word in words:
+        if _KEYBOARD_RUNS.search(word) or _REPEATED.search(word):
+            junk += 1
+        elif len(word) >= 4 and not any(ch in _VOWELS for ch in word):
+            junk += 1
+        elif len(word) >= 15:
+            junk += 1
+    return junk * 2 >= len(words)
+
+
+def screen(text: str) -> Optional[str]:
+    """Classify a user message.
+
+    Returns the fair-housing category it violates, "off_topic", "gibberish",
+    or None when it should go to the model.
+    """
+    for match in SCREEN.finditer(text):
+        if match.lastgroup != "off_topic":
+            return match.lastgroup
+        if not REAL_ESTATE_TERMS.search(text):
+            return "off_topic"
+    if is_gibberish(text):
+        return "gibberish"
+    return None
+
+
+def refusal(verdict: str) -> str:
+    """The canned answer for a screen() verdict."""
+    if verdict in FAIR_HOUSING_PATTERNS:
+        return FAIR_HOUSING_REFUSAL
+    return OFF_TOPIC_REFUSAL
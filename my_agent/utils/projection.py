@@ -0,0 +1,129 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from my_agent.utils.models.constants import PROJECTION_TEXT_LIMIT, PROJECTION_LIST_LIMIT
+
+# Fields of each listing the model sees. The full payload is kept as the
+# ToolMessage artifact for the card builder; tools without an entry here keep
+# all their fields and are only compacted. Override with a JSON object in the
+# TOOL_MODEL_FIELDS environment variable, e.g. {"search_properties": ["address"]}.
+MODEL_FIELDS: Dict[str, List[str]] = {
+    "search_properties": [
+        "mlsnum",
+        "harid",
+        "address",
+        "price",
+        "beds",
+        "bath",
+        "city",
+        "zipCode",
+        "sqft",
+        "status",
+        "property_type",
+    ],
+    "search_properties_by_address": [
+        "rank",
+        "mlsnum",
+        "harid",
+        "listing_date",
+        "address",
+        "price",
+        "beds",
+        "Baths",
+        "city",
+        "zipCode",
+        "sqft",
+        "agent",
+        "status",
+        "broker",
+        "schools",
+        "exterior",
+        "interior",
+        "rooms",
+        "openhouse",
+        "soldprice",
+        "solddate",
+        "maint_fee_includes",
+        "application_fee",
+        "security_deposit",
+        "rental_terms",
+        "rental_type",
+        "tax_rate",
+        "tax_amount",
+        "Price per SQFT",
+        "Price/SQFT",
+        "Property Type",
+        "County",
+        "Subdivision",
+        "Garage",
+        "Stories",
+        "Style",
+        "Year Built",
+        "Building Sqft",
+        "Building SQFT",
+        "Lotsize",
+        "Acre(s)",
+        "Maintenance Fee",
+        "Market Area",
+        "Owner Name",
+    ],
+}
+MODEL_FIELDS.update(json.loads(os.getenv("TOOL_MODEL_FIELDS", "{}")))
+
+# Keys holding the list of items in each tool's result
+ITEM_KEYS = {
+    "search_properties": "properties",
+    "search_properties_by_address": "properties",
+    "search_agent": "members",
+}
+
+
+def compact(value: Any, seen: Optional[Dict[str, str]] = None, path: str = "$") -> Any:
+    """Drop empty values and truncate long text and lists.
+
+    A nested object repeated verbatim (e.g. the same agent on two listings)
+    becomes {"same_as": "<path of the first one>"}, and a truncated list
+    ends with a "+N more" marker, so the model never mistakes either for
+    missing data.
+    """
+    if seen is None:
+        seen = {}
+    if isinstance(value, str):
+        value = value.strip()
+        if len(value) > PROJECTION_TEXT_LIMIT:
+            return value[:PROJECTION_TEXT_LIMIT] + "…"
+        return value
+    if isinstance(value, dict):
+        if len(value) > 1:
+            fingerprint = json.dumps(value, sort_keys=True, default=str)
+            if fingerprint in seen:
+                return {"same_as": seen[fingerprint]}
+            seen[fingerprint] = path
+        compacted = {k: compact(v, seen, f"{path}.{k}") for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        compacted = [
+            compact(v, seen, f"{path}[{i}]") for i, v in enumerate(value[:PROJECTION_LIST_LIMIT])
+        ]
+        compacted = [v for v in compacted if v not in (None, "", [], {})]
+        if len(value) > PROJECTION_LIST_LIMIT:
+            compacted.append(f"+{len(value) - PROJECTION_LIST_LIMIT} more")
+        return compacted
+    return value
+
+
+def project_result(tool_name: str, result: Any) -> str:
+    """Return the compact, model-facing JSON view of a tool result."""
+    if not isinstance(result, dict):
+        return json.dumps(compact(result), ensure_ascii=False, separators=(",", ":"))
+
+    fields = MODEL_FIELDS.get(tool_name)
+    item_key = ITEM_KEYS.get(tool_name)
+    view = {k: v for k, v in result.items() if k not in ("url",)}
+    if fields and item_key and isinstance(view.get(item_key), list):
+        view[item_key] = [
+            {k: item.get(k) for k in fields if k in item} if isinstance(item, dict) else item
+            for item in view[item_key]
+        ]
+    return json.dumps(compact(view), ensure_ascii=False, separators=(",", ":"))
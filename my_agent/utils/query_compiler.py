@@ -0,0 +1,215 @@
+"""Compile PropertySearchFields into the /listing (or /sold) query.
+
+LISTING_QUERY is the single mapping from search fields to HAR API parameters:
+one QueryParam per wire parameter, in the order of the API documentation.
+compile_listing_query walks it once and returns the canonical payload, i.e.
+every parameter that is set, encoded to its wire string and sorted by name.
+The same payload gives the request path (build_listing_path) and the cache
+key (canonical_query_key), so identical searches share one key.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from my_agent.utils.models.property_search import PropertySearchFields
+from my_agent.utils.tool_utils import (
+    encode_value,
+    map_property_availablity,
+    map_property_types_to_ids,
+)
+
+# Property types searched when the user asks for "homes" without a type
+HOME_ONLY_TYPES = ["Single Family", "Townhouse/Condo", "High-Rise", "Multi-Family"]
+
+# Availability codes an agent-only status search falls back to for consumers
+AGENT_ONLY_STATUSES = ("term", "CS", "exp", "WITH")
+
+# Lookups resolved before compiling; one that failed to resolve means no results
+RESOLVED_KEYS = (
+    "community",
+    "school_district",
+    "elemantary_school",
+    "middle_school",
+    "high_school",
+    "county",
+)
+
+Getter = Callable[[PropertySearchFields, Dict[str, Any]], Any]
+
+
+class QueryParam(NamedTuple):
+    name: str  # parameter name on the wire
+    value: Getter  # (fields, context) -> value, or None to leave the parameter out
+
+
+def field(attr: str) -> Getter:
+    return lambda fields, ctx: getattr(fields, attr)
+
+
+def flag(attr: str, quick_access: Optional[str] = None) -> Getter:
+    """1 when the field is set, or when `quick_access` is among the quick filters."""
+
+    def value(fields, ctx):
+        if getattr(fields, attr) or (quick_access and quick_access in (fields.quick_access or [])):
+            return 1
+        return None
+
+    return value
+
+
+def range_min(attr: str) -> Getter:
+    def value(fields, ctx):
+        bounds = getattr(fields, attr) or {}
+        return bounds.get("equal", bounds.get("min"))
+
+    return value
+
+
+def range_max(attr: str) -> Getter:
+    def value(fields, ctx):
+        bounds = getattr(fields, attr) or {}
+        return bounds.get("equal", bounds.get("max"))
+
+    return value
+
+
+def resolved(key: str) -> Getter:
+    """An ID resolved by a lookup before compiling (community, school, FIPS)."""
+    return lambda fields, ctx: ctx.get(key) or None
+
+
+def _property_class_id(fields, ctx):
+    if fields.property_type:
+        return map_property_types_to_ids(fields.property_type)
+    if fields.home_only:
+        return map_property_types_to_ids(HOME_ONLY_TYPES)
+    return None
+
+
+def _all_status(fields, ctx):
+    if not fields.availablity:
+        return None
+    if ctx.get("role") == "realtor":
+        return map_property_availablity(fields.availablity)
+    if fields.availablity[0] in AGENT_ONLY_STATUSES:
+        return "N"
+    return None
+
+
+def _private_pool(fields, ctx):
+    return None if fields.pool is None else int(fields.pool)
+
+
+def _dom_max(fields, ctx):
+    return 1 if fields.listed_today else fields.days_on_market_max
+
+
+LISTING_QUERY: List[QueryParam] = [
+    QueryParam("city", field("city")),
+    QueryParam("fips_code", resolved("county")),
+    QueryParam("subdivisions", field("subdivisions")),
+    QueryParam("zip_code", field("zip_code")),
+    QueryParam("mlsnum", field("mls_number")),
+    QueryParam("bedroom_min", range_min("bedrooms_beds")),
+    QueryParam("bedroom_max", range_max("bedrooms_beds")),
+    QueryParam("for_sale", lambda fields, ctx: 1 if fields.for_sale else 0),
+    QueryParam("full_bath_min", range_min("baths_bathrooms")),
+    QueryParam("full_bath_max", range_max("baths_bathrooms")),
+    QueryParam("half_bath_num", field("half_bath_num")),
+    QueryParam("lotsize_min", field("lotsize_min")),
+    QueryParam("lotsize_max", field("lotsize_max")),
+    QueryParam("acres_min", field("acres_min")),
+    QueryParam("acres_max", field("acres_max")),
+    QueryParam("garage_num", field("garage_num")),
+    QueryParam("garage_desc", field("garage_desc")),
+    QueryParam("stories", field("stories")),
+    QueryParam("new_constr", field("new_constr")),
+    QueryParam("parking", field("parking")),
+    QueryParam("listing_price_min", range_min("price")),
+    QueryParam("listing_price_max", range_max("price")),
+    QueryParam("property_class_id", _property_class_id),
+    QueryParam("max", field("limit")),
+    QueryParam("style", field("style")),
+    QueryParam("finance", field("finance")),
+    QueryParam("all_status", _all_status),
+    QueryParam("sort", field("sort")),
+    QueryParam("start", field("start")),
+    QueryParam("price_sqft_min", field("price_sqft_min")),
+    QueryParam("price_sqft_max", field("price_sqft_max")),
+    QueryParam("square_feet_min", field("square_feet_min")),
+    QueryParam("square_feet_max", field("square_feet_max")),
+    QueryParam("hoa_fee_max", field("hoa_fee_max")),
+    QueryParam("community", resolved("community")),
+    QueryParam("school_district", resolved("school_district")),
+    QueryParam("schoolmiddle", resolved("middle_school")),
+    QueryParam("schoolelementary", resolved("elemantary_school")),
+    QueryParam("schoolhigh", resolved("high_school")),
+    # Amenities
+    QueryParam("loft", flag("loft")),
+    QueryParam("private_pool", _private_pool),
+    QueryParam("area_pool", flag("area_pool")),
+    QueryParam("areatennis", flag("areatennis")),
+    QueryParam("yard", lambda fields, ctx: 1 if fields.yard is True else None),
+    QueryParam("garageapt", flag("garageapt")),
+    QueryParam("sprinkle", flag("sprinkle")),
+    QueryParam("patiodeck", flag("patiodeck")),
+    QueryParam("mediarm", flag("mediarm")),
+    QueryParam("studyrm", flag("studyrm")),
+    QueryParam("spahottub", flag("spahottub")),
+    QueryParam("culdesac", flag("culdesac")),
+    QueryParam("corner", flag("corner")),
+    QueryParam("waterview", flag("waterview")),
+    QueryParam("waterfront", flag("waterfront")),
+    QueryParam("lake", flag("lake")),
+    QueryParam("stype", flag("new_entry", "new_entry")),
+    QueryParam("wooded", flag("wooded")),
+    QueryParam("greenbelt", flag("greenbelt")),
+    QueryParam("ongolfcourse", flag("ongolfcourse")),
+    QueryParam("ingolfcom", flag("ingolfcom")),
+    QueryParam("energy", flag("energy")),
+    QueryParam("greencert", flag("greencert")),
+    QueryParam("access", flag("access")),
+    QueryParam("wheelchair", flag("wheelchair")),
+    QueryParam("elevator", flag("elevator")),
+    QueryParam("furnished", flag("furnished")),
+    # Extras
+    QueryParam("pricereduced", flag("pricereduced", "pricereduced")),
+    QueryParam("forcl", flag("forcl", "forcl")),
+    QueryParam(
+        "new_constr2",
+        lambda fields, ctx: "Yes" if flag("new_constr2", "new_constr2")(fields, ctx) else None,
+    ),
+    QueryParam("open_houses", flag("open_houses", "open_houses")),
+    QueryParam("voh_only", flag("voh_only", "voh_only")),
+    QueryParam("year_built_min", field("year_built_min")),
+    QueryParam("year_built_max", field("year_built_max")),
+    QueryParam("DOM_MAX", _dom_max),
+    QueryParam("DOM_MIN", field("days_on_market_min")),
+]
+
+
+def unresolved(ctx: Dict[str, Any]) -> bool:
+    """True if a community, school or county lookup found nothing."""
+    for key in RESOLVED_KEYS:
+        value = ctx.get(key, 0)
+        if value is None or (isinstance(value, list) and None in value):
+            return True
+    return False
+
+
+def compile_listing_query(
+    fields: PropertySearchFields, ctx: Dict[str, Any]
+) -> Tuple[str, Dict[str, str]]:
+    """Return (endpoint path, canonical payload) for a property search.
+
+    `ctx` holds the user's role and the IDs resolved for the search (see
+    RESOLVED_KEYS). Unset and empty parameters are left out.
+    """
+    payload = {}
+    for param in LISTING_QUERY:
+        value = param.value(fields, ctx)
+        if value is None:
+            continue
+        encoded = encode_value(value)
+        if encoded != "":
+            payload[param.name] = encoded
+    path = "/sold" if fields.sold else "/listing"
+    return path, dict(sorted(payload.items()))
@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from my_agent.utils.metrics import Counter, Gauge
+from my_agent.utils.models.constants import (
+    API_CALL_LIMITTER_PREFIX,
+    API_CODE_LIMIT_EXCEEDED,
+    LIMITER_INITIAL_LIMIT,
+    LIMITER_MIN_LIMIT,
+    LIMITER_MAX_LIMIT,
+    LIMITER_MAX_WAIT,
+    LIMITER_MAX_QUEUE,
+    LIMITER_LATENCY_TOLERANCE,
+)
+
+limiter_limit = Gauge("har_agent_limiter_limit", "Current concurrency limit", ["limiter"])
+limiter_in_flight = Gauge("har_agent_limiter_in_flight", "Requests holding a slot", ["limiter"])
+limiter_queue_depth = Gauge("har_agent_limiter_queue_depth", "Requests waiting for a slot", ["limiter"])
+limiter_rejected = Counter(
+    "har_agent_limiter_rejected_total", "Requests that gave up waiting for a slot", ["limiter"]
+)
+
+
+class UpstreamOverloaded(Exception):
+    """Raised when a request could not get a concurrency slot in time."""
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests to one upstream.
+
+    Each successful response raises the limit by 1/limit (about +1 per round
+    trip of the whole window). A 429, a transport error, or a short-term
+    latency average drifting above `latency_tolerance` times the long-term
+    baseline cuts it multiplicatively, at most once per cooldown. Requests over
+    the limit queue for up to `max_wait` seconds; beyond `max_queue` waiters
+    they are rejected immediately. Threads and coroutines share the same
+    limit: slot() blocks the calling thread, aslot() only the coroutine.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = LIMITER_INITIAL_LIMIT,
+        min_limit: int = LIMITER_MIN_LIMIT,
+        max_limit: int = LIMITER_MAX_LIMIT,
+        max_wait: float = LIMITER_MAX_WAIT,
+        max_queue: int = LIMITER_MAX_QUEUE,
+        latency_tolerance: float = LIMITER_LATENCY_TOLERANCE,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        cooldown: float = 1.0,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.waiting = 0
+        self.baseline: Optional[float] = None  # slow EWMA of latency
+        self.recent: Optional[float] = None  # fast EWMA of latency
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._publish()
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        timeout = self.max_wait if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self.in_flight >= int(self.limit) and self.waiting >= self.max_queue:
+                limiter_rejected.inc(limiter=self.name)
+                raise UpstreamOverloaded(f"{self.name}: {self.waiting} requests already queued")
+            self.waiting += 1
+            self._publish()
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        limiter_rejected.inc(limiter=self.name)
+                        raise UpstreamOverloaded(f"{self.name}: no slot within {timeout}s")
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+            finally:
+                self.waiting -= 1
+                self._publish()
+
+    async def aacquire(self, timeout: Optional[float] = None) -> None:
+        """Like acquire(), but waits on the event loop instead of blocking a thread."""
+        timeout = self.max_wait if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        with self._cond:
+            if self.in_flight >= int(self.limit) and self.waiting >= self.max_queue:
+                limiter_rejected.inc(limiter=self.name)
+                raise UpstreamOverloaded(f"{self.name}: {self.waiting} requests already queued")
+            self.waiting += 1
+            self._publish()
+        try:
+            while True:
+                waiter = loop.create_future()
+                with self._cond:
+                    if self.in_flight < int(self.limit):
+                        self.in_flight += 1
+                        return
+                    self._async_waiters.append((loop, waiter))
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    limiter_rejected.inc(limiter=self.name)
+                    raise UpstreamOverloaded(f"{self.name}: no slot within {timeout}s")
+                try:
+                    await asyncio.wait_for(waiter, remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self.waiting -= 1
+                self._publish()
+
+    def release(self, latency: float, status: Optional[int]) -> None:
+        """Give the slot back and adapt the limit to how the request went."""
+        with self._cond:
+            self.in_flight -= 1
+            if status is None or status == API_CODE_LIMIT_EXCEEDED:
+                self._decrease(self.backoff)
+            elif status < 500:
+                self._observe_latency(latency)
+                if self.recent > self.baseline * self.latency_tolerance:
+                    self._decrease(self.latency_backoff)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._publish()
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block and report its outcome.
+
+        The block must set `outcome["status"]` to the response status code;
+        if it raises, the request is counted as a transport failure.
+        """
+        self.acquire()
+        outcome: Dict[str, Optional[int]] = {"status": None}
+        start = time.perf_counter()
+        try:
+            yield outcome
+        finally:
+            self.release(time.perf_counter() - start, outcome["status"])
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async version of slot()."""
+        await self.aacquire()
+        outcome: Dict[str, Optional[int]] = {"status": None}
+        start = time.perf_counter()
+        try:
+            yield outcome
+        finally:
+            self.release(time.perf_counter() - start, outcome["status"])
+
+    def _observe_latency(self, latency: float) -> None:
+        if self.baseline is None:
+            self.baseline = self.recent = latency
+            return
+        self.baseline += 0.01 * (latency - self.baseline)
+        self.recent += 0.2 * (latency - self.recent)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+
+    def _publish(self) -> None:
+        limiter_limit.set(int(self.limit), limiter=self.name)
+        limiter_in_flight.set(self.in_flight, limiter=self.name)
+        limiter_queue_depth.set(self.waiting, limiter=self.name)
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "baseline_latency": self.baseline,
+                "recent_latency": self.recent,
+            }
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host: str) -> AdaptiveConcurrencyLimiter:
+    """Return the limiter shared by every request to `host`."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = AdaptiveConcurrencyLimiter(API_CALL_LIMITTER_PREFIX + host)
+        return limiter
@@ -0,0 +1,336 @@
+"""Redis-backed LangGraph checkpointer shared by every worker process.
+
+Keys (all expire TTL_ONE_DAY after the thread was last written):
+
+    {SESSION_KEY_PREFIX}{thread_id}:{ns}:index            checkpoint ids, all scored 0 (lex order)
+    {SESSION_KEY_PREFIX}{thread_id}:{ns}:cp:{checkpoint}   checkpoint + metadata + parent
+    {SESSION_KEY_PREFIX}{thread_id}:{ns}:writes:{checkpoint}  pending writes (hash)
+    {CHAT_HISTORY_KEY_PREFIX}{thread_id}                   latest message list
+
+Values are serialized with the saver's serde and zlib-compressed. `redis` is an
+optional dependency; InMemoryRedis implements the few commands used here so the
+saver can run without a server.
+"""
+import asyncio
+import threading
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+from my_agent.utils.models.constants import (
+    CHAT_HISTORY_KEY_PREFIX,
+    REDIS_URL,
+    SESSION_KEY_PREFIX,
+    TTL_ONE_DAY,
+)
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+
+class InMemoryRedis:
+    """In-process stand-in for the subset of redis-py used by RedisCheckpointSaver."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name: str) -> bool:
+        expires = self._expires.get(name)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return name in self._data
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data[name] if self._live(name) else None
+
+    def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[name] = value
+            self._expires.pop(name, None)
+            if ex:
+                self._expires[name] = time.monotonic() + ex
+        return True
+
+    def expire(self, name: str, time_: int) -> bool:
+        with self._lock:
+            if not self._live(name):
+                return False
+            self._expires[name] = time.monotonic() + time_
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            removed = sum(self._data.pop(n, None) is not None for n in names)
+            for n in names:
+                self._expires.pop(n, None)
+            return removed
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            if not self._live(name):
+                self._data[name] = {}
+            zset = self._data[name]
+            added = sum(member not in zset for member in mapping)
+            zset.update(mapping)
+            return added
+
+    def zrevrangebylex(self, name: str, max: str, min: str) -> List[bytes]:
+        with self._lock:
+            if not self._live(name):
+                return []
+            members = sorted(self._data[name], reverse=True)
+        return [m.encode() for m in members if _in_lex_range(m, min, max)]
+
+    def hset(self, name: str, key=None, value=None, mapping=None) -> int:
+        with self._lock:
+            if not self._live(name):
+                self._data[name] = {}
+            items = dict(mapping or {})
+            if key is not None:
+                items[key] = value
+            self._data[name].update(items)
+            return len(items)
+
+    def hgetall(self, name: str) -> Dict[bytes, bytes]:
+        with self._lock:
+            if not self._live(name):
+                return {}
+            return {k.encode(): v for k, v in self._data[name].items()}
+
+
+def _in_lex_range(member: str, min: str, max: str) -> bool:
+    """ZRANGEBYLEX bounds: "-"/"+" are unbounded, "[" inclusive, "(" exclusive."""
+    if min != "-" and (member < min[1:] if min[0] == "[" else member <= min[1:]):
+        return False
+    if max != "+" and (member > max[1:] if max[0] == "[" else member >= max[1:]):
+        return False
+    return True
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    def __init__(self, client=None, *, ttl: int = TTL_ONE_DAY, assistant: str = "agent", serde=None):
+        super().__init__(serde=serde)
+        self.client = client if client is not None else InMemoryRedis()
+        self.ttl = ttl
+        self.history_prefix = CHAT_HISTORY_KEY_PREFIX.format(assistant=assistant)
+
+    # Serialization: "<type>\0<zlib(bytes)>"
+    def _dump(self, obj: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(obj)
+        return type_.encode() + b"\0" + zlib.compress(data)
+
+    def _load(self, blob: bytes) -> Any:
+        type_, _, data = blob.partition(b"\0")
+        return self.serde.loads_typed((type_.decode(), zlib.decompress(data)))
+
+    def _prefix(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{SESSION_KEY_PREFIX}{thread_id}:{checkpoint_ns}"
+
+    def _touch(self, *keys: str) -> None:
+        for key in keys:
+            self.client.expire(key, self.ttl)
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> Optional[CheckpointTuple]:
+        prefix = self._prefix(thread_id, checkpoint_ns)
+        blob = self.client.get(f"{prefix}:cp:{checkpoint_id}")
+        if blob is None:
+            return None
+        record = self._load(blob)
+        writes = [
+            self._load(value)
+            for _, value in sorted(self.client.hgetall(f"{prefix}:writes:{checkpoint_id}").items())
+        ]
+        parent_config = None
+        if record["parent"]:
+            parent_config = {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": record["parent"],
+                }
+            }
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=record["checkpoint"],
+            metadata=record["metadata"],
+            parent_config=parent_config,
+            pending_writes=writes,
+        )
+
+    def _checkpoint_ids(
+        self, thread_id: str, checkpoint_ns: str, before_id: Optional[str] = None
+    ) -> List[str]:
+        """Checkpoint ids of a thread, newest first, optionally only those before `before_id`.
+
+        Checkpoint ids sort in creation order, so the index scores every id 0
+        and reads it lexicographically; worker clocks play no part.
+        """
+        index = self.client.zrevrangebylex(
+            f"{self._prefix(thread_id, checkpoint_ns)}:index",
+            f"({before_id}" if before_id else "+",
+            "-",
+        )
+        return [i.decode() if isinstance(i, bytes) else i for i in index]
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+        if not checkpoint_id:
+            ids = self._checkpoint_ids(thread_id, checkpoint_ns)
+            if not ids:
+                return None
+            checkpoint_id = ids[0]
+        return self._tuple(thread_id, checkpoint_ns, checkpoint_id)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config is None:
+            return  # listing across threads would need a SCAN over every session
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        before_id = before["configurable"].get("checkpoint_id") if before else None
+        for checkpoint_id in self._checkpoint_ids(thread_id, checkpoint_ns, before_id):
+            found = self._tuple(thread_id, checkpoint_ns, checkpoint_id)
+            if found is None:
+                continue
+            if filter and not all(found.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            yield found
+            if limit is not None:
+                limit -= 1
+                if limit <= 0:
+                    return
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        prefix = self._prefix(thread_id, checkpoint_ns)
+        record = {
+            "checkpoint": checkpoint,
+            "metadata": metadata,
+            "parent": configurable.get("checkpoint_id"),
+        }
+        self.client.set(f"{prefix}:cp:{checkpoint['id']}", self._dump(record), ex=self.ttl)
+        self.client.zadd(f"{prefix}:index", {checkpoint["id"]: 0})
+        self._touch(f"{prefix}:index")
+
+        messages = checkpoint.get("channel_values", {}).get("messages")
+        if messages is not None and not checkpoint_ns:
+            self.client.set(f"{self.history_prefix}{thread_id}", self._dump(messages), ex=self.ttl)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        prefix = self._prefix(configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+        key = f"{prefix}:writes:{configurable['checkpoint_id']}"
+        self.client.hset(
+            key,
+            mapping={
+                f"{task_id}:{idx:04d}": self._dump((task_id, channel, value))
+                for idx, (channel, value) in enumerate(writes)
+            },
+        )
+        self._touch(key)
+
+    def get_chat_history(self, thread_id: str) -> Optional[list]:
+        """Latest messages of a thread, without loading its checkpoints."""
+        blob = self.client.get(f"{self.history_prefix}{thread_id}")
+        return None if blob is None else self._load(blob)
+
+    # The redis-py client used here is synchronous; run it off the event loop.
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        found = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in found:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+
+def get_redis_checkpointer(url: Optional[str] = REDIS_URL) -> RedisCheckpointSaver:
+    """Build a checkpointer on REDIS_URL.
+
+    Use RedisCheckpointSaver(InMemoryRedis()) for a single-process fake.
+    """
+    if not url:
+        raise ValueError("CHECKPOINTER=redis needs REDIS_URL to be set")
+    if redis is None:
+        raise ImportError("The redis package is required for the Redis checkpointer")
+    return RedisCheckpointSaver(redis.Redis.from_url(url))
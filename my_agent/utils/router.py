@@ -0,0 +1,78 @@
+"""Rule-based routing of lookup-by-ID messages straight to a tool.
+
+A message that is only an MLS number, one or more HAR IDs, or a street
+address needs no model to pick the tool; route() builds the tool call
+directly. Anything else, including a message with extra filters or
+questions, returns None and goes to the agent model as before.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from my_agent.utils.models.constants import PROPERTY_CANDIDATES_MAX
+
+# Polite lead-ins that don't change what is being looked up
+_LEAD_IN = (
+    r"(?:(?:please\s+)?(?:can\s+you\s+)?(?:tell\s+me\s+about|show(?:\s+me)?|find(?:\s+me)?|"
+    r"look\s*up|search(?:\s+for)?|get(?:\s+me)?|pull\s+up|open|"
+    r"what\s+about|how\s+about|info(?:rmation)?\s+(?:on|about|for)|"
+    r"details?\s+(?:of|on|for|about))\s+)?(?:the\s+)?(?:details?\s+(?:of|on|for|about)\s+)?"
+    r"(?:(?:property|listing|home|house)\s+(?:at\s+)?)?"
+)
+_END = r"\s*[.?!]*\s*$"
+
+MLS_MESSAGE = re.compile(
+    rf"^\s*{_LEAD_IN}mls\s*(?:#|no\.?|number|num)?\s*[:#]?\s*(?P<mls>\d{{6,9}}){_END}",
+    re.IGNORECASE,
+)
+HARID_MESSAGE = re.compile(
+    rf"^\s*(?P<compare>compare\s+)?{_LEAD_IN}har\s*(?:id|#)?s?\s*[:#]?\s*"
+    rf"(?P<harids>\d{{5,10}}(?:\s*(?:,|and|&|vs\.?|versus)\s*(?:har\s*(?:id|#)?\s*[:#]?\s*)?\d{{5,10}})*){_END}",
+    re.IGNORECASE,
+)
+
+_STREET_SUFFIX = (
+    r"(?:st|street|rd|road|dr|drive|ln|lane|ave|avenue|blvd|boulevard|ct|court|cir|circle|way|"
+    r"pkwy|parkway|pl|place|trl|trail|fwy|freeway|hwy|highway|ter|terrace|loop|cv|cove|"
+    r"xing|crossing|sq|square|pt|point|bnd|bend|gln|glen|holw|hollow)"
+)
+ADDRESS_MESSAGE = re.compile(
+    rf"^\s*{_LEAD_IN}(?P<address>\d{{1,6}}\s+(?P<street>[a-z0-9.' -]+?)\s+{_STREET_SUFFIX}\.?"
+    r"(?:\s+(?:#|apt\.?|unit|ste\.?|suite)\s*[a-z0-9-]+)?"
+    r"(?:\s*,\s*[a-z .]+?)?(?:\s*,?\s*(?:tx|texas))?(?:\s*,?\s*\d{5}(?:-\d{4})?)?)"
+    rf"{_END}",
+    re.IGNORECASE,
+)
+# Words that mean "3 bed homes on Main St" is a search, not an address
+SEARCH_WORDS = re.compile(
+    r"\b(?:beds?|bedrooms?|baths?|bathrooms?|homes?|houses?|condos?|townhomes?|properties|"
+    r"listings?|lots?|under|over|near|in|on|with|for|sale|rent|sold|between|and|or)\b",
+    re.IGNORECASE,
+)
+
+
+def _harids(text: str) -> List[int]:
+    return [int(harid) for harid in re.findall(r"\d{5,10}", text)]
+
+
+def route(text: str) -> Optional[Dict[str, Any]]:
+    """The tool call ({"name", "args"}) a message maps to, or None for the model."""
+    match = MLS_MESSAGE.match(text)
+    if match:
+        # search_properties wants for_sale unless the user asked for rentals
+        fields = {"mls_number": match["mls"], "for_sale": 1}
+        return {"name": "search_properties", "args": {"fields": fields}}
+
+    match = HARID_MESSAGE.match(text)
+    if match:
+        harids = _harids(match["harids"])
+        if len(harids) == 1:
+            return {"name": "search_properties_by_address", "args": {"obj": {"harid": harids[0]}}}
+        if len(harids) <= PROPERTY_CANDIDATES_MAX:
+            return {"name": "search_properties_by_address", "args": {"obj": {"harids": harids}}}
+        return None
+
+    match = ADDRESS_MESSAGE.match(text)
+    if match and not SEARCH_WORDS.search(match["street"]):
+        address = " ".join(match["address"].split())
+        return {"name": "search_properties_by_address", "args": {"obj": {"address": address}}}
+    return None
@@ -0,0 +1,138 @@
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from my_agent.utils.metrics import Counter
+
+singleflight_shared = Counter(
+    "har_agent_singleflight_shared_total",
+    "Callers that shared an identical in-flight upstream call instead of making their own",
+    ["group"],
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result (or exception).
+    Nothing is kept once the call completes, so this is not a cache.
+    Results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, _AsyncCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            singleflight_shared.inc(group=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async do(): the call runs as its own task on the caller's event loop.
+
+        Every caller, the first included, awaits the task through a shield, so
+        a cancelled caller leaves the others waiting. The task is cancelled
+        only once every caller waiting for it has been cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        call = self._async_calls.get(key)
+        if call is None:
+            call = self._async_calls[key] = _AsyncCall(loop.create_task(fn()))
+            call.task.add_done_callback(functools.partial(self._async_done, key, call))
+        else:
+            singleflight_shared.inc(group=self.name)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _async_done(self, key: Hashable, call: _AsyncCall, task: asyncio.Task) -> None:
+        self._forget(key, call)
+        if not task.cancelled():
+            task.exception()  # mark retrieved when there are no waiters
+
+    def _forget(self, key: Hashable, call: _AsyncCall) -> None:
+        if self._async_calls.get(key) is call:
+            del self._async_calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+def single_flight(name: str, key: Callable[..., Hashable]) -> Callable:
+    """Decorator: coalesce concurrent calls whose `key(*args, **kwargs)` match.
+
+    Works on both plain and coroutine functions.
+    """
+    group = SingleFlight(name)
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await group.ado(
+                    key(*args, **kwargs), functools.partial(func, *args, **kwargs)
+                )
+
+            async_wrapper.single_flight = group
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return group.do(key(*args, **kwargs), functools.partial(func, *args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
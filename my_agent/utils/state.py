@@ -1,6 +1,16 @@
 from langgraph.graph import add_messages
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, ToolMessage
 from typing import TypedDict, Annotated, Sequence
 
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], add_messages]
+
+
+def trailing_tool_messages(messages: Sequence[BaseMessage]) -> list[ToolMessage]:
+    """Return the tool results that followed the last AI tool-calling message."""
+    results = []
+    for message in reversed(messages):
+        if not isinstance(message, ToolMessage):
+            break
+        results.append(message)
+    return results[::-1]
@@ -1,12 +1,14 @@
 
 # Standard Library Imports
 import os
-import http.client
 import json
 import urllib.parse
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import re
 import requests
 import uuid
@@ -16,8 +18,6 @@ from urllib.parse import urlencode
 # Third-Party Imports
 from dotenv import load_dotenv
 from pydantic.v1 import BaseModel, Field
-from langchain.callbacks import LangChainTracer
-from langchain.callbacks.manager import CallbackManager
 
 import hashlib
 
@@ -30,7 +30,30 @@ from my_agent.utils.models.constants import (
     TTL_ONE_DAY,
     LLM_MODEL,
     REDIS_URL,
+    HAR_WEB_BASE_URL,
+    ID_LOOKUP_MAX_WORKERS,
+    ID_LOOKUP_DEADLINE,
+    PROPERTY_DETAILS_DEADLINE,
+    PROPERTY_DETAIL_CACHE_MAXSIZE,
+    PROPERTY_DETAIL_CACHE_MAX_BYTES,
+    PROPERTY_DETAIL_TTL,
+    PROPERTY_DETAIL_CLOSED_TTL,
+    PROPERTY_DETAIL_REVALIDATE_TTL,
+    API_CODE_NOT_MODIFIED,
+    ID_CACHE_MAXSIZE,
+    ID_CACHE_TTL,
+    ID_CACHE_NEGATIVE_TTL,
+    LISTING_CACHE_MAXSIZE,
+    LISTING_CACHE_TTL,
+    LISTING_CACHE_STALE_TTL,
+    STATUS_LIST_CACHE_MAXSIZE,
+    STATUS_LIST_CACHE_MAX_BYTES,
+    STATUS_LIST_CACHE_TTL,
 )
+from my_agent.utils.cache import MISSING, SWRCache, TTLCache
+from my_agent.utils.http_client import har_api_get, http_get
+from my_agent.utils.metrics import Counter
+from my_agent.utils.singleflight import single_flight
 from langchain_core.runnables.utils import (
     ConfigurableFieldSpec,
 )
@@ -48,8 +71,6 @@ OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
 LANGCHAIN_TRACING_V2 = os.environ["LANGCHAIN_TRACING_V2"]
 LANGCHAIN_API_KEY = os.environ["LANGCHAIN_API_KEY"]
 
-tracer = LangChainTracer()
-callback_manager = CallbackManager([tracer])
 
 
 def get_api_headers(
@@ -109,102 +130,178 @@ def get_api_headers(
     return headers
 
 
+# Typeapp IDs rarely change, so resolved names are cached for days and
+# "not found" answers for a shorter while. Transport errors are not cached.
+id_lookup_cache = TTLCache(ID_CACHE_MAXSIZE, ID_CACHE_TTL, name="id_lookup")
+
+
+def _id_cache_key(kind: str, name: str, type: str = "") -> Tuple[str, str, str]:
+    return (kind, type.strip().upper(), " ".join(name.lower().split()))
+
+
+def lookup_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the school/community ID cache."""
+    return id_lookup_cache.stats()
+
+
 def search_community_ID(
     comm: str,
 ) -> dict[str, list[Any]]:
     """Search community ID using community name"""
 
+    cache_key = _id_cache_key("community", comm)
+    cached = id_lookup_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+
     payload = {"query": comm}
-    path = "http://har.com/api/typeapp/mpcfinder"
-    community_id = None
+    path = f"{HAR_WEB_BASE_URL}/api/typeapp/mpcfinder"
     try:
         json_response, status_code = get_ID(path, payload)
-        if status_code != API_SUCCESS_CODE:
-            raise Exception(f"API Request failed with status code: {status_code}")
-
     except Exception as e:
         logging.error(f"Error fetching data for user query {path}: {e}")
         return {}
-    if json_response:
-        community_id = json_response[0]["community"]
-
-    return community_id
+    return store_id_lookup(cache_key, path, json_response, status_code, "community")
 
 
 def search_school_ID(school: str, type: str) -> str:
     """Search school ID using name"""
+    cache_key = _id_cache_key("school", school, type)
+    cached = id_lookup_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+
     payload = {"query": school, "type": type}
-    path = "https://har.com/api/typeapp/schoolsearchfilter"
-    id = None
+    path = f"{HAR_WEB_BASE_URL}/api/typeapp/schoolsearchfilter"
     try:
         json_response, status_code = get_ID(path, payload)
-        if status_code != API_SUCCESS_CODE:
-            raise Exception(f"API Request failed with status code: {status_code}")
-
     except Exception as e:
         logging.error(f"Error fetching data for user query {path}: {e}")
         return {}
+    return store_id_lookup(cache_key, path, json_response, status_code, "base_id")
+
+
+def store_id_lookup(
+    cache_key: Tuple[str, str, str],
+    path: str,
+    json_response: Any,
+    status_code: int,
+    id_field: str,
+) -> Any:
+    """Pick the ID out of a typeapp response and cache it; {} on a failed call."""
+    if status_code != API_SUCCESS_CODE:
+        logging.error(
+            f"Error fetching data for user query {path}: "
+            f"API Request failed with status code: {status_code}"
+        )
+        return {}
     if json_response:
-        id = json_response[0]["base_id"]
-    return id
+        id = json_response[0][id_field]
+        id_lookup_cache.set(cache_key, id)
+        return id
+    id_lookup_cache.set(cache_key, None, ttl=ID_CACHE_NEGATIVE_TTL)
+    return None
 
-def get_property_search(
-    conn: http.client.HTTPSConnection, path: str
-) -> Tuple[Dict[str, Any], int]:
+# Result of a lookup that missed the deadline; unlike a failed lookup ({}),
+# the search must not run without its filter
+LOOKUP_TIMED_OUT = object()
+
+
+def timed_out_lookups(results: Dict[str, Any]) -> List[str]:
+    """Names of the lookups in a resolve_lookups() result that missed the deadline."""
+    return [name for name, value in results.items() if value is LOOKUP_TIMED_OUT]
+
+
+_lookup_executor = ThreadPoolExecutor(
+    max_workers=ID_LOOKUP_MAX_WORKERS, thread_name_prefix="id-lookup"
+)
+
+
+def resolve_lookups(
+    lookups: Dict[str, Callable[[], Any]], deadline: float = ID_LOOKUP_DEADLINE
+) -> Dict[str, Any]:
+    """Run independent ID lookups concurrently and collect their results.
+
+    All lookups share one deadline, so the caller waits for the slowest
+    round trip rather than the sum of them. A lookup that raises is treated
+    like a failed API call and resolves to {}; one that misses the deadline
+    resolves to LOOKUP_TIMED_OUT.
+    """
+    futures = {name: _lookup_executor.submit(fn) for name, fn in lookups.items()}
+    if futures:
+        wait(futures.values(), timeout=deadline)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            logging.error(f"ID lookup for {name} exceeded {deadline}s deadline")
+            results[name] = LOOKUP_TIMED_OUT
+        elif future.exception() is not None:
+            logging.error(f"ID lookup for {name} failed: {future.exception()}")
+            results[name] = {}
+        else:
+            results[name] = future.result()
+    return results
+
+
+@single_flight("get_property_search", lambda path: path)
+def get_property_search(path: str) -> Tuple[Dict[str, Any], int]:
     try:
         path = path.replace("#", "")
-        timestamp = int((datetime.now() + timedelta(hours=2)).timestamp() * 1000)
-        headers = get_api_headers(path, token, secret_key, timestamp, test_mode)
-
-        # Make the request via http client
-        path = path.replace(" ", "%20")
-        # print(path)
-        conn.request("GET", path, "", headers)
-        res = conn.getresponse()
-        data = res.read()
+        # Make the request over the shared connection pool
+        res = signed_api_get(path)
+        data = res.content
 
         # Convert the data to a JSON object
         json_data = json.loads(data.decode("utf-8"))
 
         # Raise appropriate exception if status code indicates an error
-        # raise_for_status_code(res.status, json_data)
+        # raise_for_status_code(res.status_code, json_data)
     except json.JSONDecodeError as e:
         logging.error(f"Failed to decode JSON: {e}")
         raise
 
     else:
-        return json_data, res.status
+        return json_data, res.status_code
 
 
 class Community_Name(BaseModel):
     comm: Optional[str] = Field(None, description="Community Name")
 
 
-def get_ID(path: str, payload: Dict[str, str]) -> Tuple[Dict[str, Any], int]:
+# Add a User-Agent header to mimic a browser request
+ID_LOOKUP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+def id_lookup_url(path: str, payload: Dict[str, str]) -> str:
     # Prepare the query parameters
     query_string = payload.get("query", "")
     type_string = payload.get("type", "")
     full_url = f"{path}?query={query_string}"
     if type_string:
         full_url = f"{full_url}&type={type_string}"
+    return full_url
 
-    # Add a User-Agent header to mimic a browser request
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
 
-    # Print the final URL for debugging purposes
-    # print("Request URL:", full_url)
+@single_flight(
+    "get_ID",
+    lambda path, payload: (path, payload.get("query", ""), payload.get("type", "")),
+)
+def get_ID(path: str, payload: Dict[str, str]) -> Tuple[Dict[str, Any], int]:
+    full_url = id_lookup_url(path, payload)
 
     # Make the GET request with headers
-    response = requests.get(full_url, headers=headers)
+    response = http_get(full_url, headers=ID_LOOKUP_HEADERS)
 
     # Read the response and decode the JSON data
     if response.status_code == API_SUCCESS_CODE:
         json_data = response.json()
     else:
         json_data = {}
-        print(f"Request failed with status code: {response.status_code}")
+        logging.error(f"Request failed with status code: {response.status_code}")
 
     return json_data, response.status_code
 
@@ -459,68 +556,611 @@ def extract_key_objects(
         return properties, found_harid
 
 
+def signed_headers(
+    path: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """Auth headers for a HAR API path, signed for the user."""
+    timestamp = int((datetime.now() + timedelta(hours=2)).timestamp() * 1000)
+    # Sign the decoded path; get_api_headers applies its own quoting
+    headers = get_api_headers(
+        urllib.parse.unquote(path),
+        token,
+        secret_key,
+        timestamp,
+        test_mode,
+        user_id,
+        member_number,
+        role,
+    )
+    if extra_headers:
+        headers.update(extra_headers)
+    return headers
+
+
+def signed_api_get(
+    path: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    """Sign a HAR API path for the user and GET it over the shared pool."""
+    headers = signed_headers(path, user_id, member_number, role, extra_headers)
+    return har_api_get(path.replace(" ", "%20"), headers)
+
+
+# Concurrent identical requests share one upstream call; the signed headers
+# differ per call, so the key is the path plus the user the request is for.
+@single_flight(
+    "get_property_details",
+    lambda path, user_id=None, member_number=None, role=0: (path, user_id, member_number, role),
+)
 def get_property_details(
-    conn: http.client.HTTPSConnection,
     path: str,
     user_id: Optional[str] = None,
     member_number: Optional[str] = None,
     role: Optional[int] = 0,
 ) -> Tuple[Dict[str, Any], int]:
     try:
-        timestamp = int((datetime.now() + timedelta(hours=2)).timestamp() * 1000)
-        headers = get_api_headers(
-            path, token, secret_key, timestamp, test_mode, user_id, member_number, role
-        )
-
-        path = path.replace(" ", "%20")
-        conn.request("GET", path, "", headers)
-        res = conn.getresponse()
-        data = res.read()
+        res = signed_api_get(path, user_id, member_number, role)
+        data = res.content
 
         # Convert the data to a JSON object
         json_data = json.loads(data.decode("utf-8"))
 
         # Raise appropriate exception if status code indicates an error
-        # raise_for_status_code(res.status, json_data)
+        # raise_for_status_code(res.status_code, json_data)
 
     except json.JSONDecodeError as e:
         logging.error(f"Failed to decode JSON: {e}")
         raise
 
     else:
-        return json_data, res.status
+        return json_data, res.status_code
+
+
+# Parsed extract_key_objects output per harid. A value is
+# {"properties", "validators", "fresh_until", "ttl"}; entries outlive their
+# freshness by PROPERTY_DETAIL_REVALIDATE_TTL when they carry validators.
+property_detail_cache = TTLCache(
+    PROPERTY_DETAIL_CACHE_MAXSIZE,
+    PROPERTY_DETAIL_TTL,
+    name="property_detail",
+    max_bytes=PROPERTY_DETAIL_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(json.dumps(entry["properties"], default=str)),
+)
 
+property_revalidations = Counter(
+    "har_agent_property_revalidations_total",
+    "Conditional property detail requests, by whether the property changed",
+    ["result"],
+)
 
-def map_property_types_to_ids(property_types: List[str]) -> str:
-    type_to_id = {
-        "Single Family": "1",
-        "Townhouse/Condo": "2",
-        "Acreage": "5",
-        "High-Rise": "6",
-        "Mid-Rise": "6",
-        "Condominium": "6",  # Assuming 'Condominium' is the same as 'Mid / High-Rise'
-        "Residential Lots": "3",
-        "Multi-Family": "4",
+# Listing statuses that rarely change again
+CLOSED_STATUSES = ("sold", "closed", "expired", "withdrawn", "terminated", "leased", "off market")
+
+
+def property_detail_ttl(status: Optional[str]) -> int:
+    """Seconds a property's details stay fresh, tiered by its listing status."""
+    status = (status or "").lower()
+    if any(closed in status for closed in CLOSED_STATUSES):
+        return PROPERTY_DETAIL_CLOSED_TTL
+    return PROPERTY_DETAIL_TTL
+
+
+@single_flight(
+    "get_property_detail",
+    lambda harid, user_id=None, member_number=None, role=0: (str(harid), user_id, role),
+)
+def get_property_detail(
+    harid: Any,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+) -> List[Dict[str, Any]]:
+    """Return extract_key_objects output for a harid, or [] if not found.
+
+    Fresh entries are served from property_detail_cache. A stale entry with
+    an ETag or Last-Modified is revalidated with a conditional request, and a
+    304 renews it without downloading or parsing the property again.
+    """
+    key = (str(harid), user_id, role)
+    entry, conditional = cached_property_detail(key)
+    if conditional is None:
+        return entry["properties"]
+    res = signed_api_get(f"/chatbot/property/{harid}", user_id, member_number, role, conditional)
+    return store_property_detail(key, entry, conditional, res)
+
+
+def cached_property_detail(key) -> Tuple[Any, Optional[Dict[str, str]]]:
+    """Look a property up in the detail cache.
+
+    Returns (entry, None) when the entry is fresh, otherwise (entry or
+    MISSING, the conditional headers to revalidate it with).
+    """
+    entry = property_detail_cache.get(key)
+    if entry is not MISSING and entry["fresh_until"] > time.monotonic():
+        return entry, None
+
+    conditional = {}
+    if entry is not MISSING:
+        validators = entry["validators"]
+        if validators.get("etag"):
+            conditional["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            conditional["If-Modified-Since"] = validators["last_modified"]
+    return entry, conditional
+
+
+def store_property_detail(key, entry, conditional: Dict[str, str], res) -> List[Dict[str, Any]]:
+    """Turn a (possibly 304) /chatbot/property response into cached properties."""
+    if res.status_code == API_CODE_NOT_MODIFIED and entry is not MISSING:
+        property_revalidations.inc(result="not_modified")
+        _cache_property_detail(key, entry["properties"], entry["validators"], entry["ttl"])
+        return entry["properties"]
+    if conditional:
+        property_revalidations.inc(result="modified")
+
+    try:
+        json_response = json.loads(res.content.decode("utf-8"))
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to decode JSON: {e}")
+        raise
+    if json_response.get("status", None) != "success":
+        return []
+    properties, found_harid = extract_key_objects(json_response)
+    if not found_harid:
+        return []
+
+    validators = {
+        "etag": res.headers.get("ETag"),
+        "last_modified": res.headers.get("Last-Modified"),
     }
+    ttl = property_detail_ttl(properties[0].get("status"))
+    _cache_property_detail(key, properties, validators, ttl)
+    return properties
+
+
+def _cache_property_detail(key, properties, validators, ttl: int) -> None:
+    revalidatable = validators.get("etag") or validators.get("last_modified")
+    property_detail_cache.set(
+        key,
+        {
+            "properties": properties,
+            "validators": validators,
+            "fresh_until": time.monotonic() + ttl,
+            "ttl": ttl,
+        },
+        ttl=ttl + (PROPERTY_DETAIL_REVALIDATE_TTL if revalidatable else 0),
+    )
+
+
+def get_properties_details(
+    harids: List[Any],
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    deadline: float = PROPERTY_DETAILS_DEADLINE,
+) -> List[Dict[str, Any]]:
+    """Fetch the details of several properties concurrently, via the detail cache.
+
+    Properties come back in the order of `harids`, each with its 1-based
+    `rank`; a harid that fails, times out or is not found is left out.
+    """
+    harids = list(dict.fromkeys(h for h in harids if h))
+    details = resolve_lookups(
+        {
+            str(harid): partial(get_property_detail, harid, user_id, member_number, role)
+            for harid in harids
+        },
+        deadline,
+    )
+    properties = []
+    for harid in harids:
+        result = details.get(str(harid)) or []
+        if result:
+            properties.append({"rank": len(properties) + 1, **result[0]})
+    return properties
+
+
+listing_cache = SWRCache(
+    LISTING_CACHE_MAXSIZE, LISTING_CACHE_TTL, LISTING_CACHE_STALE_TTL, name="listing"
+)
+
+
+# Characters left unescaped in query values; lists are sent comma-separated
+QUERY_SAFE = ",!~*'()"
+
+
+def encode_value(value: Any) -> str:
+    """Encode one query value: lists comma-joined, booleans as 1/0."""
+    if isinstance(value, (list, tuple)):
+        return ",".join(encode_value(v) for v in value)
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value).strip()
+
+
+def encode_query(payload: Dict[str, Any]) -> str:
+    """URL-encode a payload into a query string with parameters sorted by name."""
+    return "&".join(
+        f"{k}={urllib.parse.quote(encode_value(v), safe=QUERY_SAFE)}"
+        for k, v in sorted(payload.items())
+        if v is not None
+    )
 
-    ids = [type_to_id[prop] for prop in property_types if prop in type_to_id]
+
+def canonical_query_key(path: str, payload: Dict[str, Any], *context: Any) -> str:
+    """Build a cache key for a listing query.
+
+    The key is the encoded request path itself, so the same filter set always
+    maps to the same key. Auth headers are signed per request and never part
+    of the key; `context` carries what does change the response (the user id
+    and role).
+    """
+    return "|".join([build_listing_path(path, payload), *(str(c) for c in context)])
+
+
+def build_listing_path(path: str, payload: Dict[str, Any]) -> str:
+    """Join a listing endpoint and its payload into the encoded request path."""
+    return f"{path}?{encode_query(payload)}"
+
+
+def search_listings(
+    path: str,
+    cache_key: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    bypass_cache: bool = False,
+) -> Tuple[Dict[str, Any], int]:
+    """Run a /listing or /sold query, answering repeats from listing_cache.
+
+    With `bypass_cache` the API is always called, and the fresh result still
+    replaces the cached one.
+    """
+    loader = partial(get_property_details, path, user_id, member_number, role)
+    cacheable = lambda result: result[1] == API_SUCCESS_CODE
+    if bypass_cache:
+        return listing_cache.load(cache_key, loader, cacheable)
+    return listing_cache.get_or_load(cache_key, loader, cacheable)
+
+
+# Withdrawn, terminated and expired searches return the complete list in one
+# response, so it is kept per query and each page is sliced from the copy.
+STATUS_LIST_KEYS = {"WITH": "withdrawn", "term": "terminate", "exp": "expire"}
+
+status_list_cache = TTLCache(
+    STATUS_LIST_CACHE_MAXSIZE,
+    STATUS_LIST_CACHE_TTL,
+    name="status_list",
+    max_bytes=STATUS_LIST_CACHE_MAX_BYTES,
+    sizeof=lambda value: len(json.dumps(value, separators=(",", ":"))),
+)
+
+
+def search_status_list(
+    path: str,
+    payload: Dict[str, Any],
+    status_key: str,
+    user_id: Optional[str] = None,
+    member_number: Optional[str] = None,
+    role: Optional[int] = 0,
+    bypass_cache: bool = False,
+) -> Tuple[Dict[str, Any], int]:
+    """Return the full withdrawn/terminate/expire list for a listing query."""
+    payload = {k: v for k, v in payload.items() if k != "start"}
+    cache_key = canonical_query_key(path, payload, user_id, role, status_key)
+    if not bypass_cache:
+        cached = status_list_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached, API_SUCCESS_CODE
+
+    json_response, status_code = get_property_details(
+        build_listing_path(path, payload), user_id, member_number, role
+    )
+    status_list = json_response.get(status_key, {}) or {}
+    if status_code == API_SUCCESS_CODE:
+        status_list_cache.set(cache_key, status_list)
+    return status_list, status_code
+
+
+PROPERTY_TYPE_IDS = {
+    "Single Family": "1",
+    "Townhouse/Condo": "2",
+    "Acreage": "5",
+    "High-Rise": "6",
+    "Mid-Rise": "6",
+    "Condominium": "6",  # Assuming 'Condominium' is the same as 'Mid / High-Rise'
+    "Residential Lots": "3",
+    "Multi-Family": "4",
+}
+
+AVAILABILITY_CODES = {
+    "PS": "PS",
+    "OP": "OP",
+    "P": "P",
+    "Available": "Available",
+    "closd": "closd",
+    "CS": "CS",
+    "WITH": "WITH",
+    "term": "term",
+    "exp": "exp",
+}
+
+# FIPS code => County name
+FIPS_MAP = {
+    "48001": "Anderson",
+    "48003": "Andrews",
+    "48005": "Angelina",
+    "48007": "Aransas",
+    "48009": "Archer",
+    "48011": "Armstrong",
+    "48013": "Atascosa",
+    "48015": "Austin",
+    "48017": "Bailey",
+    "48019": "Bandera",
+    "48021": "Bastrop",
+    "48023": "Baylor",
+    "48025": "Bee",
+    "48027": "Bell",
+    "48029": "Bexar",
+    "48031": "Blanco",
+    "48033": "Borden",
+    "48035": "Bosque",
+    "48037": "Bowie",
+    "48039": "Brazoria",
+    "48041": "Brazos",
+    "48043": "Brewster",
+    "48045": "Briscoe",
+    "48047": "Brooks",
+    "48049": "Brown",
+    "48051": "Burleson",
+    "48053": "Burnet",
+    "48055": "Caldwell",
+    "48057": "Calhoun",
+    "48059": "Callahan",
+    "48061": "Cameron",
+    "48063": "Camp",
+    "48065": "Carson",
+    "48067": "Cass",
+    "48069": "Castro",
+    "48071": "Chambers",
+    "48073": "Cherokee",
+    "48075": "Childress",
+    "48077": "Clay",
+    "48079": "Cochran",
+    "48081": "Coke",
+    "48083": "Coleman",
+    "48085": "Collin",
+    "48087": "Collingsworth",
+    "48089": "Colorado",
+    "48091": "Comal",
+    "48093": "Comanche",
+    "48095": "Concho",
+    "48097": "Cooke",
+    "48099": "Coryell",
+    "48101": "Cottle",
+    "48103": "Crane",
+    "48105": "Crockett",
+    "48107": "Crosby",
+    "48109": "Culberson",
+    "48111": "Dallam",
+    "48113": "Dallas",
+    "48115": "Dawson",
+    "48117": "Deaf Smith",
+    "48119": "Delta",
+    "48121": "Denton",
+    "48123": "DeWitt",
+    "48125": "Dickens",
+    "48127": "Dimmit",
+    "48129": "Donley",
+    "48131": "Duval",
+    "48133": "Eastland",
+    "48135": "Ector",
+    "48137": "Edwards",
+    "48139": "Ellis",
+    "48141": "El Paso",
+    "48143": "Erath",
+    "48145": "Falls",
+    "48147": "Fannin",
+    "48149": "Fayette",
+    "48151": "Fisher",
+    "48153": "Floyd",
+    "48155": "Foard",
+    "48157": "Fort Bend",
+    "48159": "Franklin",
+    "48161": "Freestone",
+    "48163": "Frio",
+    "48165": "Gaines",
+    "48167": "Galveston",
+    "48169": "Garza",
+    "48171": "Gillespie",
+    "48173": "Glasscock",
+    "48175": "Goliad",
+    "48177": "Gonzales",
+    "48179": "Gray",
+    "48181": "Grayson",
+    "48183": "Gregg",
+    "48185": "Grimes",
+    "48187": "Guadalupe",
+    "48189": "Hale",
+    "48191": "Hall",
+    "48193": "Hamilton",
+    "48195": "Hansford",
+    "48197": "Hardeman",
+    "48199": "Hardin",
+    "48201": "Harris",
+    "48203": "Harrison",
+    "48205": "Hartley",
+    "48207": "Haskell",
+    "48209": "Hays",
+    "48211": "Hemphill",
+    "48213": "Henderson",
+    "48215": "Hidalgo",
+    "48217": "Hill",
+    "48219": "Hockley",
+    "48221": "Hood",
+    "48223": "Hopkins",
+    "48225": "Houston",
+    "48227": "Howard",
+    "48229": "Hudspeth",
+    "48231": "Hunt",
+    "48233": "Hutchinson",
+    "48235": "Irion",
+    "48237": "Jack",
+    "48239": "Jackson",
+    "48241": "Jasper",
+    "48243": "Jeff Davis",
+    "48245": "Jefferson",
+    "48247": "Jim Hogg",
+    "48249": "Jim Wells",
+    "48251": "Johnson",
+    "48253": "Jones",
+    "48255": "Karnes",
+    "48257": "Kaufman",
+    "48259": "Kendall",
+    "48261": "Kenedy",
+    "48263": "Kent",
+    "48265": "Kerr",
+    "48267": "Kimble",
+    "48269": "King",
+    "48271": "Kinney",
+    "48273": "Kleberg",
+    "48275": "Knox",
+    "48277": "Lamar",
+    "48279": "Lamb",
+    "48281": "Lampasas",
+    "48283": "La Salle",
+    "48285": "Lavaca",
+    "48287": "Lee",
+    "48289": "Leon",
+    "48291": "Liberty",
+    "48293": "Limestone",
+    "48295": "Lipscomb",
+    "48297": "Live Oak",
+    "48299": "Llano",
+    "48301": "Loving",
+    "48303": "Lubbock",
+    "48305": "Lynn",
+    "48307": "McCulloch",
+    "48309": "McLennan",
+    "48311": "McMullen",
+    "48313": "Madison",
+    "48315": "Marion",
+    "48317": "Martin",
+    "48319": "Mason",
+    "48321": "Matagorda",
+    "48323": "Maverick",
+    "48325": "Medina",
+    "48327": "Menard",
+    "48329": "Midland",
+    "48331": "Milam",
+    "48333": "Mills",
+    "48335": "Mitchell",
+    "48337": "Montague",
+    "48339": "Montgomery",
+    "48341": "Moore",
+    "48343": "Morris",
+    "48345": "Motley",
+    "48347": "Nacogdoches",
+    "48349": "Navarro",
+    "48351": "Newton",
+    "48353": "Nolan",
+    "48355": "Nueces",
+    "48357": "Ochiltree",
+    "48359": "Oldham",
+    "48361": "Orange",
+    "48363": "Palo Pinto",
+    "48365": "Panola",
+    "48367": "Parker",
+    "48369": "Parmer",
+    "48371": "Pecos",
+    "48373": "Polk",
+    "48375": "Potter",
+    "48377": "Presidio",
+    "48379": "Rains",
+    "48381": "Randall",
+    "48383": "Reagan",
+    "48385": "Real",
+    "48387": "Red River",
+    "48389": "Reeves",
+    "48391": "Refugio",
+    "48393": "Roberts",
+    "48395": "Robertson",
+    "48397": "Rockwall",
+    "48399": "Runnels",
+    "48401": "Rusk",
+    "48403": "Sabine",
+    "48405": "San Augustine",
+    "48407": "San Jacinto",
+    "48409": "San Patricio",
+    "48411": "San Saba",
+    "48413": "Schleicher",
+    "48415": "Scurry",
+    "48417": "Shackelford",
+    "48419": "Shelby",
+    "48421": "Sherman",
+    "48423": "Smith",
+    "48425": "Somervell",
+    "48427": "Starr",
+    "48429": "Stephens",
+    "48431": "Sterling",
+    "48433": "Stonewall",
+    "48435": "Sutton",
+    "48437": "Swisher",
+    "48439": "Tarrant",
+    "48441": "Taylor",
+    "48443": "Terrell",
+    "48445": "Terry",
+    "48447": "Throckmorton",
+    "48449": "Titus",
+    "48451": "Tom Green",
+    "48453": "Travis",
+    "48455": "Trinity",
+    "48457": "Tyler",
+    "48459": "Upshur",
+    "48461": "Upton",
+    "48463": "Uvalde",
+    "48465": "Val Verde",
+    "48467": "Van Zandt",
+    "48469": "Victoria",
+    "48471": "Walker",
+    "48473": "Waller",
+    "48475": "Ward",
+    "48477": "Washington",
+    "48479": "Webb",
+    "48481": "Wharton",
+    "48483": "Wheeler",
+    "48485": "Wichita",
+    "48487": "Wilbarger",
+    "48489": "Willacy",
+    "48491": "Williamson",
+    "48493": "Wilson",
+    "48495": "Winkler",
+    "48497": "Wise",
+    "48499": "Wood",
+    "48501": "Yoakum",
+    "48503": "Young",
+    "48505": "Zapata",
+    "48507": "Zavala",
+}
+
+# County name => FIPS code
+COUNTY_TO_FIPS = {v: k for k, v in FIPS_MAP.items()}
+
+
+def map_property_types_to_ids(property_types: List[str]) -> str:
+    ids = [PROPERTY_TYPE_IDS[prop] for prop in property_types if prop in PROPERTY_TYPE_IDS]
     return ",".join(ids)
 
 
 def map_property_availablity(property_types: List[str]) -> str:
-    type_to_id = {
-        "PS": "PS",
-        "OP": "OP",
-        "P": "P",
-        "Available": "Available",
-        "closd": "closd",
-        "CS": "CS",
-        "WITH": "WITH",
-        "term": "term",
-        "exp": "exp",
-    }
-
-    ids = [type_to_id[prop] for prop in property_types if prop in type_to_id]
+    ids = [AVAILABILITY_CODES[prop] for prop in property_types if prop in AVAILABILITY_CODES]
     return ",".join(ids)
 
 
@@ -529,267 +1169,6 @@ def get_fips_codes(county_names: List[str]) -> List[str]:
     Returns a list of FIPS codes for the given list of county names.
     If a county name is not found in the map, `None` is returned for that entry.
     """
-    # Original mapping: FIPS code => County name
-    FIPS_MAP = {
-        "48001": "Anderson",
-        "48003": "Andrews",
-        "48005": "Angelina",
-        "48007": "Aransas",
-        "48009": "Archer",
-        "48011": "Armstrong",
-        "48013": "Atascosa",
-        "48015": "Austin",
-        "48017": "Bailey",
-        "48019": "Bandera",
-        "48021": "Bastrop",
-        "48023": "Baylor",
-        "48025": "Bee",
-        "48027": "Bell",
-        "48029": "Bexar",
-        "48031": "Blanco",
-        "48033": "Borden",
-        "48035": "Bosque",
-        "48037": "Bowie",
-        "48039": "Brazoria",
-        "48041": "Brazos",
-        "48043": "Brewster",
-        "48045": "Briscoe",
-        "48047": "Brooks",
-        "48049": "Brown",
-        "48051": "Burleson",
-        "48053": "Burnet",
-        "48055": "Caldwell",
-        "48057": "Calhoun",
-        "48059": "Callahan",
-        "48061": "Cameron",
-        "48063": "Camp",
-        "48065": "Carson",
-        "48067": "Cass",
-        "48069": "Castro",
-        "48071": "Chambers",
-        "48073": "Cherokee",
-        "48075": "Childress",
-        "48077": "Clay",
-        "48079": "Cochran",
-        "48081": "Coke",
-        "48083": "Coleman",
-        "48085": "Collin",
-        "48087": "Collingsworth",
-        "48089": "Colorado",
-        "48091": "Comal",
-        "48093": "Comanche",
-        "48095": "Concho",
-        "48097": "Cooke",
-        "48099": "Coryell",
-        "48101": "Cottle",
-        "48103": "Crane",
-        "48105": "Crockett",
-        "48107": "Crosby",
-        "48109": "Culberson",
-        "48111": "Dallam",
-        "48113": "Dallas",
-        "48115": "Dawson",
-        "48117": "Deaf Smith",
-        "48119": "Delta",
-        "48121": "Denton",
-        "48123": "DeWitt",
-        "48125": "Dickens",
-        "48127": "Dimmit",
-        "48129": "Donley",
-        "48131": "Duval",
-        "48133": "Eastland",
-        "48135": "Ector",
-        "48137": "Edwards",
-        "48139": "Ellis",
-        "48141": "El Paso",
-        "48143": "Erath",
-        "48145": "Falls",
-        "48147": "Fannin",
-        "48149": "Fayette",
-        "48151": "Fisher",
-        "48153": "Floyd",
-        "48155": "Foard",
-        "48157": "Fort Bend",
-        "48159": "Franklin",
-        "48161": "Freestone",
-        "48163": "Frio",
-        "48165": "Gaines",
-        "48167": "Galveston",
-        "48169": "Garza",
-        "48171": "Gillespie",
-        "48173": "Glasscock",
-        "48175": "Goliad",
-        "48177": "Gonzales",
-        "48179": "Gray",
-        "48181": "Grayson",
-        "48183": "Gregg",
-        "48185": "Grimes",
-        "48187": "Guadalupe",
-        "48189": "Hale",
-        "48191": "Hall",
-        "48193": "Hamilton",
-        "48195": "Hansford",
-        "48197": "Hardeman",
-        "48199": "Hardin",
-        "48201": "Harris",
-        "48203": "Harrison",
-        "48205": "Hartley",
-        "48207": "Haskell",
-        "48209": "Hays",
-        "48211": "Hemphill",
-        "48213": "Henderson",
-        "48215": "Hidalgo",
-        "48217": "Hill",
-        "48219": "Hockley",
-        "48221": "Hood",
-        "48223": "Hopkins",
-        "48225": "Houston",
-        "48227": "Howard",
-        "48229": "Hudspeth",
-        "48231": "Hunt",
-        "48233": "Hutchinson",
-        "48235": "Irion",
-        "48237": "Jack",
-        "48239": "Jackson",
-        "48241": "Jasper",
-        "48243": "Jeff Davis",
-        "48245": "Jefferson",
-        "48247": "Jim Hogg",
-        "48249": "Jim Wells",
-        "48251": "Johnson",
-        "48253": "Jones",
-        "48255": "Karnes",
-        "48257": "Kaufman",
-        "48259": "Kendall",
-        "48261": "Kenedy",
-        "48263": "Kent",
-        "48265": "Kerr",
-        "48267": "Kimble",
-        "48269": "King",
-        "48271": "Kinney",
-        "48273": "Kleberg",
-        "48275": "Knox",
-        "48277": "Lamar",
-        "48279": "Lamb",
-        "48281": "Lampasas",
-        "48283": "La Salle",
-        "48285": "Lavaca",
-        "48287": "Lee",
-        "48289": "Leon",
-        "48291": "Liberty",
-        "48293": "Limestone",
-        "48295": "Lipscomb",
-        "48297": "Live Oak",
-        "48299": "Llano",
-        "48301": "Loving",
-        "48303": "Lubbock",
-        "48305": "Lynn",
-        "48307": "McCulloch",
-        "48309": "McLennan",
-        "48311": "McMullen",
-        "48313": "Madison",
-        "48315": "Marion",
-        "48317": "Martin",
-        "48319": "Mason",
-        "48321": "Matagorda",
-        "48323": "Maverick",
-        "48325": "Medina",
-        "48327": "Menard",
-        "48329": "Midland",
-        "48331": "Milam",
-        "48333": "Mills",
-        "48335": "Mitchell",
-        "48337": "Montague",
-        "48339": "Montgomery",
-        "48341": "Moore",
-        "48343": "Morris",
-        "48345": "Motley",
-        "48347": "Nacogdoches",
-        "48349": "Navarro",
-        "48351": "Newton",
-        "48353": "Nolan",
-        "48355": "Nueces",
-        "48357": "Ochiltree",
-        "48359": "Oldham",
-        "48361": "Orange",
-        "48363": "Palo Pinto",
-        "48365": "Panola",
-        "48367": "Parker",
-        "48369": "Parmer",
-        "48371": "Pecos",
-        "48373": "Polk",
-        "48375": "Potter",
-        "48377": "Presidio",
-        "48379": "Rains",
-        "48381": "Randall",
-        "48383": "Reagan",
-        "48385": "Real",
-        "48387": "Red River",
-        "48389": "Reeves",
-        "48391": "Refugio",
-        "48393": "Roberts",
-        "48395": "Robertson",
-        "48397": "Rockwall",
-        "48399": "Runnels",
-        "48401": "Rusk",
-        "48403": "Sabine",
-        "48405": "San Augustine",
-        "48407": "San Jacinto",
-        "48409": "San Patricio",
-        "48411": "San Saba",
-        "48413": "Schleicher",
-        "48415": "Scurry",
-        "48417": "Shackelford",
-        "48419": "Shelby",
-        "48421": "Sherman",
-        "48423": "Smith",
-        "48425": "Somervell",
-        "48427": "Starr",
-        "48429": "Stephens",
-        "48431": "Sterling",
-        "48433": "Stonewall",
-        "48435": "Sutton",
-        "48437": "Swisher",
-        "48439": "Tarrant",
-        "48441": "Taylor",
-        "48443": "Terrell",
-        "48445": "Terry",
-        "48447": "Throckmorton",
-        "48449": "Titus",
-        "48451": "Tom Green",
-        "48453": "Travis",
-        "48455": "Trinity",
-        "48457": "Tyler",
-        "48459": "Upshur",
-        "48461": "Upton",
-        "48463": "Uvalde",
-        "48465": "Val Verde",
-        "48467": "Van Zandt",
-        "48469": "Victoria",
-        "48471": "Walker",
-        "48473": "Waller",
-        "48475": "Ward",
-        "48477": "Washington",
-        "48479": "Webb",
-        "48481": "Wharton",
-        "48483": "Wheeler",
-        "48485": "Wichita",
-        "48487": "Wilbarger",
-        "48489": "Willacy",
-        "48491": "Williamson",
-        "48493": "Wilson",
-        "48495": "Winkler",
-        "48497": "Wise",
-        "48499": "Wood",
-        "48501": "Yoakum",
-        "48503": "Young",
-        "48505": "Zapata",
-        "48507": "Zavala",
-    }
-
-    # Invert the map: County name => FIPS code
-    COUNTY_TO_FIPS = {v: k for k, v in FIPS_MAP.items()}
-
     results = []
     for name in county_names:
         # Return FIPS code if county is found, else None
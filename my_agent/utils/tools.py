@@ -1,17 +1,15 @@
-import http.client
-import json
-import urllib
-from typing import List, Optional, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
-from langchain.tools import tool
-from my_agent.utils.tool_utils import search_community_ID, search_school_ID, get_fips_codes,get_property_details, map_property_types_to_ids, map_property_availablity, get_property_search, extract_key_objects, get_api_headers
-from urllib.parse import urlencode
+from langchain_core.tools import StructuredTool, ToolException
+from langchain_core.runnables import RunnableConfig
+from my_agent.utils.tool_utils import search_community_ID, search_school_ID, get_fips_codes, get_properties_details, get_property_search, resolve_lookups, timed_out_lookups, build_listing_path
 from my_agent.utils.models.property_search import PropertySearchFields, PropertySearchInput
-
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
-import re
-import requests
+from my_agent.utils.models.constants import PROPERTY_CANDIDATES_MAX
+from my_agent.utils.projection import project_result
+from my_agent.utils.query_compiler import compile_listing_query, unresolved
+from my_agent.utils.pagination import get_cursor, save_cursor, advance_cursor, page_bounds, fetch_page, prefetch_page, afetch_page, aprefetch_page
+from my_agent.utils.async_tool_utils import aget_property_search, aget_properties_details, aresolve_lookups, asearch_community_ID, asearch_school_ID
 import os
 
 v1_url: str = os.environ["V1_URL"]
@@ -39,81 +37,130 @@ class PropertySearchByAddress(BaseModel):
         None, description="List of addresses to search properties"
     )
     harid: Optional[int] = Field(None, description="List of harid to search properties")
+    harids: Optional[List[int]] = Field(
+        None, description="Several harids to compare side by side"
+    )
+    candidates: Optional[int] = Field(
+        None,
+        description=f"Number of closest matches to return for an ambiguous or partial address (1-{PROPERTY_CANDIDATES_MAX})",
+    )
 
-@tool
-def search_properties_by_address(
+def _search_properties_by_address_tool(
     obj: PropertySearchByAddress,
-) -> dict[str, list[Any]]:
-    """Search properties based on property address OR harid filter"""
+) -> Tuple[str, dict[str, list[Any]]]:
+    """Search properties based on property address OR harid filter; address wins when both are given.
+    Set candidates when the address is ambiguous or partial to get the closest matches ranked,
+    and use harids to compare several properties."""
+    result = _search_properties_by_address(obj)
+    return project_result("search_properties_by_address", result), result
+
+
+async def _asearch_properties_by_address_tool(
+    obj: PropertySearchByAddress,
+) -> Tuple[str, dict[str, list[Any]]]:
+    result = await _asearch_properties_by_address(obj)
+    return project_result("search_properties_by_address", result), result
+
 
-    conn = http.client.HTTPSConnection("api.har.com")
+def _quicksearch_path(address: str) -> str:
+    # Use quick search API if address is provided
+    path = "/chatbot/quicksearch"
+    payload = {"query": address}
+    query_string = "&".join([f"{k}={v}" for k, v in payload.items()])
+    return f"{path}?{query_string}"
 
-    # Check if address or MLS number is provided and set appropriate endpoint and payload
+
+def _candidate_harids(obj: PropertySearchByAddress, quicksearch: Optional[Dict[str, Any]]) -> List[Any]:
+    """The harids to fetch, best match first."""
     if obj.address:
-        # Use quick search API if address is provided
-        path = "/chatbot/quicksearch"
-        payload = {"query": obj.address}
-    elif obj.harid:
-        # Use listing API directly if MLS number is provided
-        path = f"/chatbot/property/{obj.harid}"
-        payload = {}  # No payload needed for direct listing lookup
-    else:
+        limit = min(max(obj.candidates or 1, 1), PROPERTY_CANDIDATES_MAX)
+        return [
+            result.get("harid", None) for result in (quicksearch or {}).get("results", [])
+        ][:limit]
+    if obj.harids:
+        return obj.harids[:PROPERTY_CANDIDATES_MAX]
+    return [obj.harid]
+
+
+def _quicksearch_request(obj: PropertySearchByAddress) -> Optional[str]:
+    """The quick search path to resolve an address; None for a harid-only lookup.
+
+    As before harids were added, an address takes priority over harid(s).
+    """
+    if obj.address:
+        return _quicksearch_path(obj.address)
+    if not (obj.harids or obj.harid):
         raise ValueError("Either address or MLS number must be provided.")
+    return None
+
 
-    # Convert payload to query string if there are payload parameters
-    if payload:
-        query_string = "&".join([f"{k}={v}" for k, v in payload.items()])
-        path += f"?{query_string}"
-
-    json_response = None
-    try:
-        if obj.harid:
-            json_response, _ = get_property_search(conn, path)
-
-        # Handle quick search API response if an address was used
-        elif obj.address:
-            json_response, _ = get_property_search(conn, path)
-            harids = [
-                result.get("harid", None) for result in json_response.get("results", [])
-            ]
-
-            # Use the first MLS number to get listing details
-            if harids:
-                listing_path = f"/chatbot/property/{harids[0]}"
-                json_response, _ = get_property_details(conn, listing_path)
-
-    finally:
-        conn.close()
-
-    # Process the listing API response to extract required details
-    if json_response.get("status", None) == "success":
-        result, found_harid = extract_key_objects(json_response)
-        return {
-            "total_number_of_properties": 1 if found_harid else 0,
-            "properties": result,
-        }
-
-    return {"total_number_of_properties": 0, "properties": []}
-
-@tool(args_schema=AgentSearchInput)
-def search_agent(Name: AgentSearchInput):
+def _properties_result(properties: List[Any]) -> dict[str, list[Any]]:
+    return {"total_number_of_properties": len(properties), "properties": properties}
+
+
+def _search_properties_by_address(obj: PropertySearchByAddress) -> dict[str, list[Any]]:
+    path = _quicksearch_request(obj)
+    quicksearch = get_property_search(path)[0] if path else None
+
+    # Details of every candidate are fetched concurrently over the shared pool
+    return _properties_result(get_properties_details(_candidate_harids(obj, quicksearch)))
+
+
+async def _asearch_properties_by_address(obj: PropertySearchByAddress) -> dict[str, list[Any]]:
+    path = _quicksearch_request(obj)
+    quicksearch = (await aget_property_search(path))[0] if path else None
+
+    return _properties_result(await aget_properties_details(_candidate_harids(obj, quicksearch)))
+
+
+search_properties_by_address = StructuredTool.from_function(
+    func=_search_properties_by_address_tool,
+    coroutine=_asearch_properties_by_address_tool,
+    name="search_properties_by_address",
+    response_format="content_and_artifact",
+)
+
+
+def _search_agent_tool(Name: AgentSearchInput):
     """Search property agent based on name """    
-    agent_detail = None
-    conn = http.client.HTTPSConnection("api.har.com")
-    path = f"/member?agent={Name}"
-    timestamp = int((datetime.now() + timedelta(hours=2)).timestamp() * 1000)
-    headers = get_api_headers(path, token, secret_key, timestamp, test_mode, "", "", "")
-    path = path.replace(" ", "%20")
-    conn.request("GET", path, "", headers)
-    res = conn.getresponse()
-    data = res.read()
-    print(data, headers)
-    # Convert the data to a JSON object
-    agent_detail = json.loads(data.decode("utf-8"))
+    result = _search_agent(Name)
+    return project_result("search_agent", result), result
+
+
+async def _asearch_agent_tool(Name: AgentSearchInput):
+    result = await _asearch_agent(Name)
+    return project_result("search_agent", result), result
+
+
+def _agent_path(Name: str) -> str:
+    return f"/member?agent={Name}"
+
+
+def _search_agent(Name: str) -> Dict[str, Any]:
+    agent_detail, _ = get_property_search(_agent_path(Name))
+    return _trim_members(agent_detail)
+
+
+async def _asearch_agent(Name: str) -> Dict[str, Any]:
+    agent_detail, _ = await aget_property_search(_agent_path(Name))
+    return _trim_members(agent_detail)
+
+
+def _trim_members(agent_detail: Dict[str, Any]) -> Dict[str, Any]:
+    # The response may be shared with concurrent callers; copy rather than mutate
     if "members" in agent_detail and isinstance(agent_detail["members"], list):
-        agent_detail["members"] = agent_detail["members"][:5]
+        agent_detail = {**agent_detail, "members": agent_detail["members"][:5]}
     return agent_detail
 
+
+search_agent = StructuredTool.from_function(
+    func=_search_agent_tool,
+    coroutine=_asearch_agent_tool,
+    name="search_agent",
+    args_schema=AgentSearchInput,
+    response_format="content_and_artifact",
+)
+
 # Example use:
 # Create an instance of PropertySearchFields with the desired search criteria
 # search_criteria = PropertySearchFields(city=["Houston"], max_price=500000)
@@ -121,8 +168,9 @@ def search_agent(Name: AgentSearchInput):
 
 
 
-@tool(args_schema=PropertySearchInput)
-def search_properties(fields: PropertySearchFields) -> Dict[str, Any]:
+def _search_properties_tool(
+    fields: PropertySearchFields, config: RunnableConfig
+) -> Tuple[str, Dict[str, Any]]:
     """
     Description: Search properties based on some input filters
 
@@ -132,21 +180,39 @@ def search_properties(fields: PropertySearchFields) -> Dict[str, Any]:
     Guidelines:
         - [IMPORTANT] Analyze the user query carefully before assigning filters, dont confuse similar naming features.
         - Divide the user prompt and extract the features.
-        - Invoke tool on show more each time , Analyze 'chat_history' to assign start filter a value, It should be incremented by 5 each time.
+        - Invoke tool on show more each time with only next_page set to True; the previous filters and position are remembered.
         - while using tool always add for_sale field into it with its value unless for_rent is specified.
         - To initialize filters for 'price', 'baths_bathrooms' and 'bedrooms_beds', it will be a dictionary with number with 'equal'[priority], 'min', 'max' as keys.
         - MANDATORY: For each query [INVOKE_TOOL=TRUE] → accumulate_all_previous_filters + add_new_valid_filters → MUST_EXECUTE_TOOL(complete_filter_set) → await_results before_response
     """
+    result = _search_properties(fields, config)
+    return project_result("search_properties", result), result
+
+
+async def _asearch_properties_tool(
+    fields: PropertySearchFields, config: RunnableConfig
+) -> Tuple[str, Dict[str, Any]]:
+    result = await _asearch_properties(fields, config)
+    return project_result("search_properties", result), result
+
+
+NO_ACTIVE_SEARCH = "No active search to continue on this conversation; resend the filters."
 
-    
+NO_RESULTS = {
+    "total_number_of_properties": 0,
+    "start": 0,
+    "stop": 0,
+    "properties": None,
+}
+
+
+def _current_user() -> Tuple[str, str, Any, int]:
+    """Return (user_id, member_number, role, islogin) of the signed-in user."""
     # Getting user
     user = None #get_user()
-    islogin = 0
 
     if user:
         user_id = str(user.get("userid", ""))
-        role = 0
-        islogin = 1
         role = int(user.get("roleid"))
         member_number = user.get("member_number", "")
 
@@ -154,244 +220,169 @@ def search_properties(fields: PropertySearchFields) -> Dict[str, Any]:
             role = "realtor"
         else:
             role = "consumer"
+        return user_id, member_number, role, 1
 
-    else:
-        user_id = ""
-        role = 0
-        member_number = ""
-
-    community_id = 0
-    county = None
-    bedroom_min = None
-    bedroom_max = None
-    bath_max = None
-    bath_min = None
-    price_min = None
-    price_max = None
-    schooldistrict = None
-    eschool = None
-    mschool = None
-    hschool = None
-    property_types = {
-        "Single Family": "1",
-        "Townhouse/Condo": "2",
-        "High-Rise": "6",
-        "Mid-Rise": "6",
-        "Condominium": "6",  # Assuming 'Condominium' is the same as 'Mid / High-Rise'
-        "Multi-Family": "4",
-    }
-    checker = []
-    if fields.listed_today:
-        fields.days_on_market_max = 1
+    return "", "", 0, 0
+
+
+def _id_lookups(fields: PropertySearchFields, community_id, school_id) -> Dict[str, Any]:
+    """School and community lookups for a search, to be resolved concurrently."""
+    lookups = {}
     if fields.school_district:
-        schooldistrict = search_school_ID(fields.school_district, type="D")
-        checker.append(schooldistrict)
+        lookups["school_district"] = partial(
+            school_id, fields.school_district, type="D"
+        )
     if fields.elemantary_school:
-        eschool = search_school_ID(fields.elemantary_school, type="E")
-        checker.append(eschool)
+        lookups["elemantary_school"] = partial(
+            school_id, fields.elemantary_school, type="E"
+        )
     if fields.middle_school:
-        mschool = search_school_ID(fields.middle_school, type="M")
-        checker.append(mschool)
+        lookups["middle_school"] = partial(
+            school_id, fields.middle_school, type="M"
+        )
     if fields.high_school:
-        hschool = search_school_ID(fields.high_school, type="H")
-        checker.append(hschool)
-
+        lookups["high_school"] = partial(
+            school_id, fields.high_school, type="H"
+        )
     if fields.community:
-        community_id = search_community_ID(fields.community[0])
-        checker.append(community_id)
+        lookups["community"] = partial(community_id, fields.community[0])
+    return lookups
+
+
+def _listing_cursor(
+    fields: PropertySearchFields, resolved: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Compile a search into the cursor of its first page; None if a lookup failed."""
+    timed_out = timed_out_lookups(resolved)
+    if timed_out:
+        # Searching without these filters would pass off broader results as matches
+        raise ToolException(
+            f"The {', '.join(timed_out)} lookup timed out, so the search was not run; try again."
+        )
     if fields.county:
-        county = get_fips_codes(fields.county)
-        checker.append(county)
-
-    if any(value is None for value in checker):
-        return {
-            "total_number_of_properties": 0,
-            "start": 0,
-            "stop": 0,
-            "properties": None,
-        }
-
-    if fields.baths_bathrooms:
-        if "min" in fields.baths_bathrooms:
-            bath_min = fields.baths_bathrooms["min"]
-        if "max" in fields.baths_bathrooms:
-            bath_max = fields.baths_bathrooms["max"]
-        if "equal" in fields.baths_bathrooms:
-            bath_min = fields.baths_bathrooms["equal"]
-            bath_max = fields.baths_bathrooms["equal"]
-
-    if fields.bedrooms_beds:
-        if "min" in fields.bedrooms_beds:
-            bedroom_min = fields.bedrooms_beds["min"]
-        if "max" in fields.bedrooms_beds:
-            bedroom_max = fields.bedrooms_beds["max"]
-        if "equal" in fields.bedrooms_beds:
-            bedroom_max = fields.bedrooms_beds["equal"]
-            bedroom_min = fields.bedrooms_beds["equal"]
-
-    if fields.price:
-        if "min" in fields.price:
-            price_min = fields.price["min"]
-        if "max" in fields.price:
-            price_max = fields.price["max"]
-        if "equal" in fields.price:
-            price_max = fields.price["equal"]
-            price_min = fields.price["equal"]
-
-    payload = {
-        "city": (
-            ",".join(urllib.parse.quote(city, safe="!~*'()") for city in fields.city)
-            if fields.city
-            else None
-        ),
-        "fips_code": (
-            ",".join(
-                urllib.parse.quote(fips_code, safe="!~*'()") for fips_code in county
-            )
-            if county
-            else None
-        ),
-        "subdivisions": fields.subdivisions,
-        "zip_code": fields.zip_code,
-        "mlsnum": fields.mls_number,
-        "bedroom_min": bedroom_min,
-        "bedroom_max": bedroom_max,
-        "for_sale": 0 if not (fields.for_sale) else 1,
-        "full_bath_min": bath_min,
-        "full_bath_max": bath_max,
-        "half_bath_num": fields.half_bath_num,
-        "lotsize_min": fields.lotsize_min,
-        "lotsize_max": fields.lotsize_max,
-        "acres_min": fields.acres_min,
-        "acres_max": fields.acres_max,
-        "garage_num": fields.garage_num,
-        "garage_desc": fields.garage_desc,
-        "stories": (
-            ",".join(str(story) for story in fields.stories) if fields.stories else None
-        ),
-        "new_constr": fields.new_constr,
-        "parking": fields.parking,
-        "listing_price_min": price_min,
-        "listing_price_max": price_max,
-        "property_class_id": (
-            map_property_types_to_ids(fields.property_type)
-            if fields.property_type
-            else (property_types if fields.home_only else None)
-        ),
-        "max": fields.limit,
-        "style": fields.style,
-        "finance": fields.finance,
-        "all_status": (
-            map_property_availablity(fields.availablity)
-            if fields.availablity and role == "realtor"
-            else (
-                ["N"]
-                if fields.availablity
-                and (
-                    fields.availablity[0] == "term"
-                    or fields.availablity[0] == "CS"
-                    or fields.availablity[0] == "exp"
-                    or fields.availablity[0] == "WITH"
-                )
-                and role != "realtor"
-                else (None)
-            )
-        ),
-        "sort": fields.sort,
-        "start": fields.start,
-        "price_sqft_min": fields.price_sqft_min,
-        "price_sqft_max": fields.price_sqft_max,
-        "square_feet_min": fields.square_feet_min,
-        "square_feet_max": fields.square_feet_max,
-        "hoa_fee_max": fields.hoa_fee_max,
-        "community": community_id if community_id else None,
-        "school_district": schooldistrict if schooldistrict else None,
-        "schoolmiddle": mschool if mschool else None,
-        "schoolelementary": eschool if eschool else None,
-        "schoolhigh": hschool if hschool else None,
-        # Amenities:
-        "loft": 1 if fields.loft else None,
-        "private_pool": (
-            1 if fields.pool is True else (0 if fields.pool is False else None)
-        ),
-        "area_pool": 1 if fields.area_pool else None,
-        "areatennis": 1 if fields.areatennis else None,
-        "yard": 1 if fields.yard is True else None,
-        "garageapt": 1 if fields.garageapt else None,
-        "sprinkle": 1 if fields.sprinkle else None,
-        "patiodeck": 1 if fields.patiodeck else None,
-        "mediarm": 1 if fields.mediarm else None,
-        "studyrm": 1 if fields.studyrm else None,
-        "spahottub": 1 if fields.spahottub else None,
-        "culdesac": 1 if fields.culdesac else None,
-        "corner": 1 if fields.corner else None,
-        "waterview": 1 if fields.waterview else None,
-        "waterfront": 1 if fields.waterfront else None,
-        "lake": 1 if fields.lake else None,
-        # "dom": 1 if fields.listed_today is True else None,
-        "stype": (
-            1
-            if fields.new_entry is True or "new_entry" in fields.quick_access
-            else None
-        ),
-        "wooded": 1 if fields.wooded else None,
-        "greenbelt": 1 if fields.greenbelt else None,
-        "ongolfcourse": 1 if fields.ongolfcourse else None,
-        "ingolfcom": 1 if fields.ingolfcom else None,
-        "energy": 1 if fields.energy else None,
-        "greencert": 1 if fields.greencert else None,
-        "access": 1 if fields.access else None,
-        "wheelchair": 1 if fields.wheelchair else None,
-        "elevator": 1 if fields.elevator else None,
-        "furnished": 1 if fields.furnished else None,
-        # Extras
-        "pricereduced": (
-            1 if fields.pricereduced or "pricereduced" in fields.quick_access else None
-        ),
-        "forcl": 1 if fields.forcl or "forcl" in fields.quick_access else None,
-        "new_constr2": (
-            "Yes"
-            if fields.new_constr2 or "new_constr2" in fields.quick_access
-            else None
-        ),
-        "open_houses": (
-            1 if fields.open_houses or "open_houses" in fields.quick_access else None
-        ),
-        "voh_only": 1 if fields.voh_only or "voh_only" in fields.quick_access else None,
-        "year_built_min": fields.year_built_min,
-        "year_built_max": fields.year_built_max,
-        "DOM_MAX": fields.days_on_market_max,
-        "DOM_MIN": fields.days_on_market_min,
-        # Add more filters as needed...
+        resolved["county"] = get_fips_codes(fields.county)
+    if unresolved(resolved):
+        return None
+
+    user_id, member_number, role, islogin = _current_user()
+    path, payload = compile_listing_query(fields, {**resolved, "role": role})
+    return {
+        "path": path,
+        "payload": payload,
+        "availablity": fields.availablity,
+        "user_id": user_id,
+        "member_number": member_number,
+        "role": role,
+        "islogin": islogin,
     }
 
-    conn = http.client.HTTPSConnection("api.har.com")
-    path = "/listing"
-    if fields.sold:
-        path = "/sold"
-    payload = {k: v for k, v in payload.items() if v is not None}
 
-    # convert payload to query string and concatenate with path
-    fullpath: str = path + "?" + "&".join([f"{k}={v}" for k, v in payload.items()])
-    fullpath = fullpath.replace("%20", " ")
+def _next_page_cursor(config: RunnableConfig) -> Dict[str, Any]:
+    """The cursor one page past the last search on this thread.
 
-    try:
-        json_response, _ = get_property_details(
-            conn, fullpath, user_id, member_number, role
-        )
-    finally:
-        conn.close()
+    Cursors live in this process only (see pagination.cursor_store), so a
+    thread picked up by another worker has none to continue from.
+    """
+    cursor = get_cursor(config.get("configurable", {}).get("thread_id"))
+    if not cursor:
+        raise ToolException(NO_ACTIVE_SEARCH)
+    return advance_cursor(cursor)
+
+
+def _search_properties(
+    fields: PropertySearchFields, config: RunnableConfig
+) -> Dict[str, Any]:
+
+    # "Show more": continue from the cursor of the last search on this thread
+    if fields.next_page:
+        return _serve_listing_page(_next_page_cursor(config), config)
+
+    # Resolve school and community IDs concurrently instead of one by one
+    resolved = resolve_lookups(_id_lookups(fields, search_community_ID, search_school_ID))
+    cursor = _listing_cursor(fields, resolved)
+    if cursor is None:
+        return dict(NO_RESULTS)
+    return _serve_listing_page(cursor, config)
+
+
+async def _asearch_properties(
+    fields: PropertySearchFields, config: RunnableConfig
+) -> Dict[str, Any]:
+    if fields.next_page:
+        return await _aserve_listing_page(_next_page_cursor(config), config)
+
+    resolved = await aresolve_lookups(
+        _id_lookups(fields, asearch_community_ID, asearch_school_ID)
+    )
+    cursor = _listing_cursor(fields, resolved)
+    if cursor is None:
+        return dict(NO_RESULTS)
+    return await _aserve_listing_page(cursor, config)
+
+
+search_properties = StructuredTool.from_function(
+    func=_search_properties_tool,
+    coroutine=_asearch_properties_tool,
+    name="search_properties",
+    args_schema=PropertySearchInput,
+    response_format="content_and_artifact",
+    handle_tool_error=True,
+)
+
+
+def _serve_listing_page(cursor: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+    """Fetch the page a cursor points at and prefetch the one after it."""
+    bypass_cache = config.get("configurable", {}).get("bypass_search_cache", False)
+    json_response, _ = fetch_page(cursor, bypass_cache)
+    result, next_cursor = _listing_page(json_response, cursor, config)
+    if next_cursor:
+        prefetch_page(next_cursor)
+    return result
+
+
+async def _aserve_listing_page(cursor: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+    bypass_cache = config.get("configurable", {}).get("bypass_search_cache", False)
+    json_response, _ = await afetch_page(cursor, bypass_cache)
+    result, next_cursor = _listing_page(json_response, cursor, config)
+    if next_cursor:
+        aprefetch_page(next_cursor)
+    return result
+
+
+def _listing_page(
+    json_response: Dict[str, Any], cursor: Dict[str, Any], config: RunnableConfig
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Format a fetched page and remember its cursor.
+
+    Returns the result and the cursor of the next page to prefetch, if any.
+    """
+    configurable = config.get("configurable", {})
+    result = _format_listing_response(json_response, cursor)
+    save_cursor(configurable.get("thread_id"), cursor)
+    start, limit = page_bounds(cursor)
+    if configurable.get("bypass_search_cache", False):
+        return result, None
+    if result["total_number_of_properties"] > start + limit:
+        return result, advance_cursor(cursor)
+    return result, None
+
+
+def _format_listing_response(
+    json_response: Dict[str, Any], cursor: Dict[str, Any]
+) -> Dict[str, Any]:
+    availablity = cursor["availablity"]
+    islogin = cursor["islogin"]
 
     # Extract the share URL
-    if fields.availablity is not None and len(fields.availablity) > 0:
-        if fields.availablity[0] == "WITH":
+    if availablity is not None and len(availablity) > 0:
+        if availablity[0] == "WITH":
             json_response = json_response.get("withdrawn", [])
-        elif fields.availablity[0] == "term":
+        elif availablity[0] == "term":
             json_response = json_response.get("terminate", [])
-        elif fields.availablity[0] == "exp":
+        elif availablity[0] == "exp":
             json_response = json_response.get("expire", [])
 
-    if fields.availablity is not None and len(fields.availablity) > 0:
+    if availablity is not None and len(availablity) > 0:
         total = (
             int(json_response.get("total", 0))
             if json_response and json_response.get("total")
@@ -407,17 +398,19 @@ def search_properties(fields: PropertySearchFields) -> Dict[str, Any]:
             if json_response and json_response.get("stop")
             else 0
         )
-        end = start + 5 if start > 0 else 5
 
         if (
-            fields.availablity[0] == "WITH"
-            or fields.availablity[0] == "term"
-            or fields.availablity[0] == "exp"
+            availablity[0] == "WITH"
+            or availablity[0] == "term"
+            or availablity[0] == "exp"
         ):
+            # The cached list is complete; slice out the cursor's page
+            start, limit = page_bounds(cursor)
             if json_response and json_response.get("listings"):
-                results = json_response.get("listings", [])[start:end]
+                results = json_response.get("listings", [])[start : start + limit]
             else:
                 results = []
+            stop = start + len(results)
         else:
             results = json_response.get("listings", [])
     else:
@@ -463,7 +456,7 @@ def search_properties(fields: PropertySearchFields) -> Dict[str, Any]:
         )
 
     return {
-        "url": fullpath,
+        "url": build_listing_path(cursor["path"], cursor["payload"]),
         "total_number_of_properties": total,
         "start": start,
         "stop": stop,
@@ -0,0 +1,66 @@
+"""Build the expensive process-wide objects before the first request arrives."""
+import logging
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable
+
+from my_agent.utils.http_client import get_session
+from my_agent.utils.models.constants import (
+    HAR_API_BASE_URL,
+    HAR_WEB_BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    LLM_BASE_URL,
+    PARSER_MODEL,
+)
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+def _preconnect() -> None:
+    """Open a pooled keep-alive connection (DNS + TLS) to each upstream host."""
+    session = get_session()
+    for url in {HAR_API_BASE_URL, HAR_WEB_BASE_URL}:
+        session.head(url, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+
+
+def _preconnect_llm() -> None:
+    """Open a keep-alive connection in the pool the OpenAI models share."""
+    from my_agent.utils.model_registry import get_llm_http_client
+
+    get_llm_http_client().head(LLM_BASE_URL or OPENAI_BASE_URL)
+
+
+def warm_up(model_names: Iterable[str] = ("openai",), preconnect: bool = True) -> Dict[str, float]:
+    """Build chat models, the HTTP pools, the tokenizer and the answer schema.
+
+    `model_names` are the agent models; the output_parser model is built too.
+
+    A failing step is logged and skipped, so warm-up never blocks startup.
+    Returns the seconds spent in each step.
+    """
+    from my_agent.utils.history import _encoding
+    from my_agent.utils.model_registry import registry
+    from my_agent.utils.nodes import _get_model
+    from my_agent.utils.parser import get_schema
+
+    timings: Dict[str, float] = {}
+
+    def step(name: str, func: Callable) -> None:
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            logging.warning(f"Warm-up step {name} failed: {e}")
+        timings[name] = time.perf_counter() - start
+
+    for model_name in model_names:
+        step(f"model:{model_name}", partial(_get_model, model_name))
+    step(f"parser_model:{PARSER_MODEL}", partial(registry.get, PARSER_MODEL))
+    step("http_pool", get_session)
+    if preconnect:
+        step("connect", _preconnect)
+        step("llm_connect", _preconnect_llm)
+    step("tokenizer", _encoding)
+    step("answer_schema", partial(get_schema, {"messages": []}))
+    return timings
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from my_agent.utils import cache
+from my_agent.utils.cache import MISSING, SWRCache, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire_after_their_ttl(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=5)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2, ttl=20)
+
+    clock.now += 4.9
+    assert ttl_cache.get("a") == 1
+    clock.now += 0.1
+    assert ttl_cache.get("a") is MISSING
+    assert ttl_cache.get("b") == 2
+    assert ttl_cache.stats()["expirations"] == 1
+
+
+def test_none_is_cached_as_a_value(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=5)
+    ttl_cache.set("negative", None)
+    assert ttl_cache.get("negative") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=60)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")  # "b" is now least recently used
+    ttl_cache.set("c", 3)
+
+    assert ttl_cache.get("b") is MISSING
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("c") == 3
+    assert ttl_cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_skips_oversized_values(clock):
+    ttl_cache = TTLCache(maxsize=100, ttl=60, max_bytes=10, sizeof=len)
+    ttl_cache.set("a", "xxxx")
+    ttl_cache.set("b", "xxxx")
+    ttl_cache.set("c", "xxxx")
+    assert ttl_cache.get("a") is MISSING
+    assert ttl_cache.bytes == 8
+
+    ttl_cache.set("huge", "x" * 11)
+    assert ttl_cache.get("huge") is MISSING
+    assert len(ttl_cache) == 2
+
+
+def test_stale_entry_is_served_while_one_refresh_replaces_it(clock):
+    swr = SWRCache(maxsize=10, ttl=5, stale_ttl=30)
+    swr.load("k", lambda: "v1")
+
+    refreshed = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        refreshed.set()
+        return "v2"
+
+    clock.now += 6
+    assert swr.get_or_load("k", loader) == "v1"
+    assert swr.get_or_load("k", loader) == "v1"  # refresh already running
+    release.set()
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if not swr._refreshing:
+            break
+        time.sleep(0.01)
+
+    assert len(calls) == 1
+    assert swr.get_or_load("k", loader) == "v2"
+    assert swr.stats()["stale_hits"] == 2
+
+
+def test_expired_stale_entry_is_loaded_inline(clock):
+    swr = SWRCache(maxsize=10, ttl=5, stale_ttl=30)
+    swr.load("k", lambda: "v1")
+    clock.now += 36
+    assert swr.get_or_load("k", lambda: "v2") == "v2"
+
+
+def test_uncacheable_values_are_not_stored(clock):
+    swr = SWRCache(maxsize=10, ttl=5, stale_ttl=30)
+    assert swr.get_or_load("k", lambda: {}, cacheable=bool) == {}
+    assert swr.get("k") is MISSING
+
+
+def test_async_stale_refresh_runs_as_a_task(clock):
+    swr = SWRCache(maxsize=10, ttl=5, stale_ttl=30)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return f"v{len(calls)}"
+
+    async def main():
+        assert await swr.aget_or_load("k", loader) == "v1"
+        clock.now += 6
+        assert await swr.aget_or_load("k", loader) == "v1"
+        assert await swr.aget_or_load("k", loader) == "v1"
+        await asyncio.gather(*cache._refresh_tasks)
+        return await swr.aget_or_load("k", loader)
+
+    assert asyncio.run(main()) == "v2"
+    assert len(calls) == 2
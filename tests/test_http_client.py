@@ -0,0 +1,20 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+
+from my_agent.utils.http_client import LoopLocalTransport
+
+
+def test_each_event_loop_gets_its_own_pool():
+    transport = LoopLocalTransport()
+
+    async def pools():
+        return transport._transport(), transport._transport()
+
+    first, again = asyncio.run(pools())
+    second, _ = asyncio.run(pools())
+    assert first is again
+    assert first is not second
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+import httpx
+import openai
+
+from benchmarks.run import configure_environment
+
+configure_environment("http://127.0.0.1")
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.pydantic_v1 import BaseModel
+from langchain_core.runnables import RunnableLambda
+
+from benchmarks.fake_model import ScriptedChatModel
+from my_agent.utils.model_registry import registry
+from my_agent.utils.nodes import aoutput_parser, output_parser
+from my_agent.utils.parser import render_answer
+
+PARSER = "test-structured-parser"
+CONFIG = {"configurable": {"structured_output": True, "parser_model_name": PARSER}}
+STATE = {"messages": [HumanMessage(content="What is an option fee?"), AIMessage(content="A fee.")]}
+
+
+class _Strict(BaseModel):
+    pretext: int
+
+
+def _invalid_answer(_messages):
+    # What a provider's schema validation raises on a malformed response
+    return _Strict(pretext="not a number")
+
+
+def _rejected_schema(_messages):
+    # What the provider returns when it rejects the strict schema
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    raise openai.BadRequestError(
+        "Invalid schema for response_format 'Answer'",
+        response=httpx.Response(400, request=request),
+        body=None,
+    )
+
+
+class InvalidStructuredModel(ScriptedChatModel):
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(_invalid_answer)
+
+
+class RejectedStructuredModel(ScriptedChatModel):
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(_rejected_schema)
+
+
+class UnsupportedStructuredModel(ScriptedChatModel):
+    def with_structured_output(self, schema, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture(
+    autouse=True,
+    params=[InvalidStructuredModel, RejectedStructuredModel, UnsupportedStructuredModel],
+    ids=["validation_error", "bad_request", "unsupported"],
+)
+def parser_model(request):
+    registry.register(PARSER, request.param(role="output_parser", script={"answer": "A fee."}))
+
+
+def test_output_parser_falls_back_to_the_prompt_schema():
+    result = output_parser(STATE, CONFIG)
+    assert result["messages"][0].content == render_answer("A fee.")
+
+
+def test_aoutput_parser_falls_back_to_the_prompt_schema():
+    result = asyncio.run(aoutput_parser(STATE, CONFIG))
+    assert result["messages"][0].content == render_answer("A fee.")
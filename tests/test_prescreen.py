@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.prescreen_corpus import CASES
+from my_agent.utils.prescreen import FAIR_HOUSING_REFUSAL, OFF_TOPIC_REFUSAL, refusal, screen
+
+
+@pytest.mark.parametrize("message, expected", CASES)
+def test_corpus(message, expected):
+    assert screen(message) == expected
+
+
+def test_refusal_text_follows_the_verdict():
+    assert refusal("religion") == FAIR_HOUSING_REFUSAL
+    assert refusal("off_topic") == OFF_TOPIC_REFUSAL
+    assert refusal("gibberish") == OFF_TOPIC_REFUSAL
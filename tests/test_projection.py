@@ -0,0 +1,23 @@
+import json
+
+from my_agent.utils.models.constants import PROJECTION_LIST_LIMIT
+from my_agent.utils.projection import compact, project_result
+
+
+def test_repeated_object_points_at_its_first_occurrence():
+    agent = {"name": "Jane Doe", "phone": "713-555-0100"}
+    result = {"properties": [{"harid": 1, "agent": agent}, {"harid": 2, "agent": dict(agent)}]}
+
+    view = json.loads(project_result("search_properties_by_address", result))
+    assert view["properties"][0]["agent"] == agent
+    assert view["properties"][1]["agent"] == {"same_as": "$.properties[0].agent"}
+
+
+def test_truncated_list_says_how_many_were_cut():
+    items = list(range(PROJECTION_LIST_LIMIT + 3))
+    assert compact(items) == items[:PROJECTION_LIST_LIMIT] + ["+3 more"]
+    assert compact(items[:PROJECTION_LIST_LIMIT]) == items[:PROJECTION_LIST_LIMIT]
+
+
+def test_empty_values_are_dropped():
+    assert compact({"a": "", "b": None, "c": [], "d": {"e": " x "}}) == {"d": {"e": "x"}}
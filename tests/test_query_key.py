@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from benchmarks.run import configure_environment
+
+configure_environment("http://127.0.0.1")
+
+from my_agent.utils.tool_utils import build_listing_path, canonical_query_key, encode_query
+
+
+def test_parameter_order_does_not_change_the_key():
+    first = canonical_query_key("/listing", {"city": "Houston", "beds": 3, "for_sale": 1}, "u1", 0)
+    second = canonical_query_key("/listing", {"for_sale": 1, "beds": 3, "city": "Houston"}, "u1", 0)
+    assert first == second
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"beds": "3", "pool": 1, "zip": "77002,77005"},
+        {"beds": 3, "pool": True, "zip": ["77002", "77005"]},
+        {"beds": " 3 ", "pool": 1, "zip": ("77002", "77005"), "garage": None},
+    ],
+)
+def test_equivalent_values_encode_the_same(payload):
+    assert encode_query(payload) == "beds=3&pool=1&zip=77002,77005"
+
+
+def test_values_are_url_encoded_once():
+    assert encode_query({"city": "Sugar Land", "q": "a&b=c"}) == "city=Sugar%20Land&q=a%26b%3Dc"
+    assert build_listing_path("/listing", {"city": "Sugar Land"}) == "/listing?city=Sugar%20Land"
+
+
+def test_user_context_separates_keys():
+    payload = {"city": "Houston"}
+    assert canonical_query_key("/listing", payload, "u1", 0) != canonical_query_key(
+        "/listing", payload, "u2", 0
+    )
+    assert canonical_query_key("/listing", payload, "u1", 0) != canonical_query_key(
+        "/sold", payload, "u1", 0
+    )
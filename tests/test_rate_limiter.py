@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from my_agent.utils.rate_limiter import AdaptiveConcurrencyLimiter, UpstreamOverloaded
+
+
+def limiter(**kwargs):
+    options = {"initial_limit": 4, "min_limit": 1, "max_limit": 8, "max_wait": 1, "max_queue": 2}
+    options.update(kwargs)
+    return AdaptiveConcurrencyLimiter("test", **options)
+
+
+def complete(lim, latency=0.1, status=200):
+    lim.acquire()
+    lim.release(latency, status)
+
+
+def test_success_raises_the_limit_up_to_max():
+    lim = limiter()
+    complete(lim)
+    assert lim.limit == pytest.approx(4.25)
+    for _ in range(200):
+        complete(lim)
+    assert lim.limit == 8
+
+
+@pytest.mark.parametrize("status", [429, None])
+def test_throttling_or_transport_error_halves_the_limit_once_per_cooldown(status):
+    lim = limiter(cooldown=60)
+    complete(lim, status=status)
+    assert lim.limit == 2
+    complete(lim, status=status)  # within the cooldown
+    assert lim.limit == 2
+
+
+def test_limit_never_drops_below_min():
+    lim = limiter(cooldown=0)
+    for _ in range(10):
+        complete(lim, status=429)
+    assert lim.limit == 1
+
+
+def test_server_error_leaves_the_limit_alone():
+    lim = limiter()
+    complete(lim, status=503)
+    assert lim.limit == 4
+
+
+def test_latency_drift_backs_off():
+    lim = limiter(cooldown=0, latency_tolerance=2.0)
+    for _ in range(20):
+        complete(lim, latency=0.1)
+    grown = lim.limit
+    for _ in range(5):
+        complete(lim, latency=1.0)
+    assert lim.limit < grown
+
+
+def test_waiter_gets_the_slot_when_one_is_released():
+    lim = limiter(initial_limit=1)
+    lim.acquire()
+    acquired = threading.Event()
+
+    def wait_for_slot():
+        lim.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=wait_for_slot)
+    thread.start()
+    assert not acquired.wait(0.05)
+    lim.release(0.1, 200)
+    assert acquired.wait(1)
+    thread.join()
+    assert lim.in_flight == 1
+
+
+def test_waiting_past_max_wait_is_rejected():
+    lim = limiter(initial_limit=1)
+    lim.acquire()
+    start = time.monotonic()
+    with pytest.raises(UpstreamOverloaded):
+        lim.acquire(timeout=0.05)
+    assert time.monotonic() - start < 1
+    assert lim.waiting == 0
+
+
+def test_full_queue_rejects_immediately():
+    lim = limiter(initial_limit=1, max_queue=1)
+    lim.acquire()
+    thread = threading.Thread(target=lambda: pytest.raises(UpstreamOverloaded, lim.acquire, 0.5))
+    thread.start()
+    for _ in range(100):
+        if lim.waiting:
+            break
+        time.sleep(0.005)
+    assert lim.waiting == 1
+
+    start = time.monotonic()
+    with pytest.raises(UpstreamOverloaded):
+        lim.acquire()
+    assert time.monotonic() - start < 0.1
+    thread.join()
+
+
+def test_async_waiter_is_woken_by_a_release():
+    lim = limiter(initial_limit=1)
+
+    async def main():
+        await lim.aacquire()
+        waiter = asyncio.ensure_future(lim.aacquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done() and lim.waiting == 1
+        lim.release(0.1, 200)
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(main())
+    assert lim.in_flight == 1 and lim.waiting == 0
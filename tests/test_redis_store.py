@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from my_agent.utils.redis_store import InMemoryRedis, RedisCheckpointSaver, get_redis_checkpointer
+
+
+def _checkpoint(checkpoint_id, messages):
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = checkpoint_id
+    checkpoint["channel_values"] = {"messages": messages}
+    return checkpoint
+
+
+def _config(thread_id, checkpoint_id=None):
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+@pytest.fixture
+def saver():
+    return RedisCheckpointSaver(InMemoryRedis())
+
+
+def test_put_then_get_tuple_returns_latest(saver):
+    first = saver.put(_config("t1"), _checkpoint("1", ["hi"]), {"step": 1}, {})
+    saver.put(first, _checkpoint("2", ["hi", "hello"]), {"step": 2}, {})
+
+    found = saver.get_tuple(_config("t1"))
+    assert found.checkpoint["id"] == "2"
+    assert found.checkpoint["channel_values"]["messages"] == ["hi", "hello"]
+    assert found.metadata == {"step": 2}
+    assert found.parent_config["configurable"]["checkpoint_id"] == "1"
+    assert saver.get_chat_history("t1") == ["hi", "hello"]
+
+
+def test_get_tuple_by_id_includes_pending_writes(saver):
+    config = saver.put(_config("t1"), _checkpoint("1", []), {}, {})
+    saver.put_writes(config, [("messages", "a"), ("route", "agent")], "task-1")
+
+    found = saver.get_tuple(_config("t1", "1"))
+    assert found.pending_writes == [("task-1", "messages", "a"), ("task-1", "route", "agent")]
+    assert saver.get_tuple(_config("t2")) is None
+
+
+def test_list_is_newest_first_and_honours_before_limit_and_filter(saver):
+    config = _config("t1")
+    for step, checkpoint_id in enumerate(["1", "2", "3"]):
+        config = saver.put(config, _checkpoint(checkpoint_id, []), {"step": step}, {})
+
+    assert [c.checkpoint["id"] for c in saver.list(_config("t1"))] == ["3", "2", "1"]
+    assert [c.checkpoint["id"] for c in saver.list(_config("t1"), limit=2)] == ["3", "2"]
+    assert [c.checkpoint["id"] for c in saver.list(_config("t1"), before=_config("t1", "3"))] == ["2", "1"]
+    assert [c.checkpoint["id"] for c in saver.list(_config("t1"), filter={"step": 1})] == ["2"]
+    assert list(saver.list(_config("other"))) == []
+
+
+def test_get_redis_checkpointer_requires_a_url():
+    with pytest.raises(ValueError):
+        get_redis_checkpointer(url=None)
+
+
+def test_latest_checkpoint_follows_id_order_not_write_order(saver):
+    # Workers may write out of order; ids, not clocks, decide which is newest
+    saver.put(_config("t1"), _checkpoint("2", ["newer"]), {}, {})
+    saver.put(_config("t1"), _checkpoint("1", ["older"]), {}, {})
+
+    assert saver.get_tuple(_config("t1")).checkpoint["id"] == "2"
+    assert [c.checkpoint["id"] for c in saver.list(_config("t1"))] == ["2", "1"]
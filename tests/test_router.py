@@ -0,0 +1,51 @@
+import pytest
+
+from my_agent.utils.router import route
+
+
+def by_address(obj):
+    return {"name": "search_properties_by_address", "args": {"obj": obj}}
+
+
+def by_mls(mls):
+    return {"name": "search_properties", "args": {"fields": {"mls_number": mls, "for_sale": 1}}}
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("MLS 12345678", by_mls("12345678")),
+        ("mls# 1234567", by_mls("1234567")),
+        ("show me mls number 87654321?", by_mls("87654321")),
+        ("HAR 84736251", by_address({"harid": 84736251})),
+        ("compare har 84736251 and 12345678", by_address({"harids": [84736251, 12345678]})),
+        ("har ids 11111, 22222 & 33333", by_address({"harids": [11111, 22222, 33333]})),
+        ("1234 Westheimer Rd", by_address({"address": "1234 Westheimer Rd"})),
+        ("1234  Westheimer Rd apt 5", by_address({"address": "1234 Westheimer Rd apt 5"})),
+        (
+            "please find 5501 Main St, Houston, TX 77002",
+            by_address({"address": "5501 Main St, Houston, TX 77002"}),
+        ),
+    ],
+)
+def test_lookups_go_straight_to_a_tool(message, expected):
+    assert route(message) == expected
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "3x2",  # sizes and ratios
+        "4/2",
+        "77002",  # ZIP only
+        "$400k",  # price only
+        "under 500000",
+        "HAR 123",  # too short for a HAR ID
+        "MLS 12345678 with a pool",  # extra filters
+        "3 bed homes on Main St",  # a search, not an address
+        "har 11111, 22222, 33333, 44444, 55555, 66666",  # more than PROPERTY_CANDIDATES_MAX
+        "hello",
+    ],
+)
+def test_everything_else_goes_to_the_model(message):
+    assert route(message) is None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from my_agent.utils.singleflight import SingleFlight, single_flight
+
+
+def test_concurrent_identical_keys_make_one_call():
+    group = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"harid": 1}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(group.do, "k", fetch)
+        assert started.wait(5)
+        followers = [pool.submit(group.do, "k", fetch) for _ in range(4)]
+        time.sleep(0.05)  # let the followers join the in-flight call
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert group.in_flight() == 0
+
+
+def test_error_is_shared_and_not_remembered():
+    group = SingleFlight("test")
+
+    def fail():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        group.do("k", fail)
+    assert group.do("k", lambda: 2) == 2
+
+
+def test_async_identical_keys_make_one_call_and_distinct_keys_do_not():
+    calls = []
+
+    @single_flight("test", lambda harid: harid)
+    async def fetch(harid):
+        calls.append(harid)
+        await asyncio.sleep(0.01)
+        return {"harid": harid}
+
+    async def main():
+        return await asyncio.gather(fetch(1), fetch(1), fetch(1), fetch(2))
+
+    results = asyncio.run(main())
+    assert sorted(calls) == [1, 2]
+    assert results[0] is results[1] is results[2]
+    assert results[3] == {"harid": 2}
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    group = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main():
+        first = asyncio.ensure_future(group.ado("k", fetch))
+        second = asyncio.ensure_future(group.ado("k", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == 42
+        assert first.cancelled()
+
+    asyncio.run(main())
+    assert group.in_flight() == 0
+
+
+def test_call_is_cancelled_once_every_caller_has_left():
+    group = SingleFlight("test")
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    async def main():
+        callers = [asyncio.ensure_future(group.ado("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert finished == []
+    assert group.in_flight() == 0